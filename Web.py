@@ -1,10 +1,87 @@
 import streamlit as st
-import subprocess
-import platform
 import os
+import sys
+import time
+import atexit
+
+import launcher
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "exercises"))
+import worker
+from progress import ProgressReader
+from specs import EXERCISES
+from stream import FrameReader
 
 st.set_page_config(page_title="FitDesk", layout="wide")
 
+
+@st.cache_resource
+def get_registry():
+    # One registry per server process, shared by every browser session
+    registry = launcher.Registry()
+    atexit.register(registry.stop_all)
+    return registry
+
+
+registry = get_registry()
+
+
+@st.cache_resource
+def get_progress_reader():
+    return ProgressReader("worker")
+
+
+@st.cache_resource
+def get_frame_reader():
+    return FrameReader("worker")
+
+
+def worker_starting():
+    return any(t["name"] == "worker" and t["running"] for t in registry.status())
+
+
+def request_when_up(message, timeout=20.0):
+    # A worker that was just launched needs a moment before it listens
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return worker.request(message)
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.25)
+
+
+def start_on_worker(message, flags, name):
+    # Hand the request to the running worker, or start one that runs it once the models are loaded
+    stream = st.session_state.get("in_page_video", False)
+    message = dict(message, stream=stream)
+    try:
+        reply = request_when_up(message) if worker_starting() else worker.request(message)
+        if reply["ok"]:
+            st.success(f"{name} started.")
+        elif reply.get("running"):
+            st.warning(f"{reply['running'].replace('_', ' ').title()} is still running.")
+        else:
+            st.error(f"Failed to start {name}: {reply.get('error')}")
+    except ConnectionRefusedError:
+        if worker_starting():
+            st.error(f"The exercise worker is not answering, so {name} was not started. Please try again.")
+            return
+        try:
+            argv = ["python3", os.path.join("exercises", "worker.py"), *flags]
+            if stream:
+                argv.append("--stream")
+            registry.launch("worker", argv)
+            st.success(f"{name} started.")
+        except launcher.TrackerLimitError as e:
+            st.error(f"Cannot start another tracker: {e}")
+        except Exception as e:
+            st.error(f"Failed to launch script: {e}")
+    except Exception as e:
+        st.error(f"Failed to reach the exercise worker: {e}")
+
+
 if 'category' not in st.session_state:
     st.session_state.category = None
 if 'selected_exercise' not in st.session_state:
@@ -20,6 +97,8 @@ st.caption("45 minutes - Intermediate")
 
 if st.button("Start a new workout"):
     st.session_state['page'] = 'workout'
+    start_on_worker({"cmd": "circuit", "circuit": "full_body"}, ["--circuit", "full_body"],
+                    "Full body strength")
 
 st.markdown("### Featured collections")
 cols = st.columns(4)
@@ -68,6 +147,9 @@ if st.session_state.category == "quick":
     if st.button("Bicep Curl Right"):
         st.session_state.selected_exercise = "bicep_curl_right"
         st.session_state.start_exercise = False
+    if st.button("Bicep Curls (Both Arms)"):
+        st.session_state.selected_exercise = "bicep_curls"
+        st.session_state.start_exercise = False
 
 elif st.session_state.category == "hiit":
     st.markdown("### High Intensity Training")
@@ -92,6 +174,9 @@ elif st.session_state.category == "yoga":
     if st.button("Tree Pose Left"):
         st.session_state.selected_exercise = "tree_pose_left"
         st.session_state.start_exercise = False
+    if st.button("Tree Pose (Both Legs)"):
+        st.session_state.selected_exercise = "tree_pose"
+        st.session_state.start_exercise = False
 
 elif st.session_state.category == "stretching":
     st.markdown("### Stretching Routines")
@@ -104,6 +189,9 @@ elif st.session_state.category == "stretching":
     if st.button("Arm Rotation Right"):
         st.session_state.selected_exercise = "arm_rotation_right"
         st.session_state.start_exercise = False
+    if st.button("Arm Rotations (Both Arms)"):
+        st.session_state.selected_exercise = "arm_rotations"
+        st.session_state.start_exercise = False
 
 
 # Start of exercises
@@ -111,37 +199,72 @@ elif st.session_state.category == "stretching":
 
 if st.session_state.selected_exercise:
     st.markdown("### Ready to begin your exercise?")
+    st.toggle("Show the video in this page", key="in_page_video")
     if st.button("Start Exercise"):
         st.session_state.start_exercise = True
 
     if st.session_state.start_exercise:
-        exercise_file_map = {
-            "shoulder_shrugs": "shoulder_shrugs.py",
-            "wrist_curls": "wrist_curls.py",
-            "bicep_curl_left": "bicep_curl_left.py",
-            "bicep_curl_right": "bicep_curl_right.py",
-            "squats": "squats.py",
-            "alternate_toe_touch": "alternate_toe_touch.py",
-            "high_knees": "high_knees.py",
-            "cobra_pose": "cobra_pose.py",
-            "tree_pose_right": "tree_pose_right.py",
-            "tree_pose_left": "tree_pose_left.py",
-            "neck_rotation": "neck_rotation.py",
-            "arm_rotation_left": "arm_rotation_left.py",
-            "arm_rotation_right": "arm_rotation_right.py"
-        }
-
-        selected_file = exercise_file_map.get(st.session_state.selected_exercise)
-        script_path = os.path.join("exercises", selected_file)
-
-        if selected_file and os.path.exists(script_path):
-            try:
-                subprocess.Popen(["python3", script_path],
-                                 stdout=subprocess.DEVNULL,
-                                 stderr=subprocess.DEVNULL,
-                                 start_new_session=True)
-                st.success(f"{st.session_state.selected_exercise.replace('_', ' ').title()} started.")
-            except Exception as e:
-                st.error(f"Failed to launch script: {e}")
+        # Launch once per click; later reruns must not start the exercise again
+        st.session_state.start_exercise = False
+        exercise = st.session_state.selected_exercise
+        if exercise in EXERCISES:
+            name = exercise.replace('_', ' ').title()
+            start_on_worker({"cmd": "start", "exercise": exercise}, ["--start", exercise], name)
         else:
-            st.error(f"Script not found at {script_path}")
+            st.error(f"Unknown exercise {exercise}")
+
+
+# Running trackers
+
+trackers = registry.status()
+if trackers:
+    st.markdown("### Trackers")
+    for tracker in trackers:
+        cols = st.columns([4, 1, 1])
+        state = "running" if tracker["running"] else f"exited with code {tracker['returncode']}"
+        cols[0].write(f"{tracker['name']} (pid {tracker['pid']}): {state}")
+        if tracker["running"]:
+            if cols[1].button("Stop exercise", key=f"stop_exercise_{tracker['name']}"):
+                try:
+                    worker.request({"cmd": "stop"})
+                except OSError:
+                    pass
+            if cols[2].button("Stop tracker", key=f"stop_{tracker['name']}"):
+                registry.stop(tracker["name"])
+                st.rerun()
+
+
+@st.fragment(run_every=1.0)
+def show_progress():
+    # Reruns only this fragment, reading the tracker's shared progress record
+    record = get_progress_reader().read()
+    if record is None or record["state"] == "stopped":
+        return
+    st.markdown("### Progress")
+    cols = st.columns(4)
+    cols[0].metric("Exercise", record["exercise"].replace('_', ' ').title() or "-")
+    target = f"/{record['target']}" if record["target"] else ""
+    cols[1].metric("Reps", f"{record['reps']}{target}")
+    cols[2].metric("Phase", record["phase"] or record["state"])
+    cols[3].metric("FPS", f"{record['fps']:.1f}")
+    if record["error"]:
+        st.error(record["error"])
+    elif record["state"] == "running" and record["age"] > 5:
+        st.warning("The tracker has stopped sending updates.")
+
+
+show_progress()
+
+
+@st.fragment(run_every=0.1)
+def show_video():
+    frame = get_frame_reader().read()
+    if frame is not None and frame.seq != st.session_state.get("video_seq"):
+        st.session_state.video_seq = frame.seq
+        st.session_state.video_jpeg = frame.jpeg
+    if st.session_state.get("video_jpeg") is not None:
+        st.image(st.session_state.video_jpeg, use_container_width=True)
+
+
+if st.session_state.get("in_page_video"):
+    show_video()
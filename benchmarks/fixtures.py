@@ -0,0 +1,275 @@
+"""Deterministic synthetic fixtures for the benchmarks.
+
+Each exercise gets a landmark trace of a made-up person doing it: a fixed
+skeleton moved by a simple per-exercise motion, with a little seeded jitter,
+sampled at 30 fps in a 640x480 frame. The motions go through the same
+calibration and rep thresholds as a real session, so replaying a trace
+through the engine also checks the rep counting. fixture_video() renders one
+of the traces as a filled stick figure for benchmarks that need real
+decoding and model inference.
+
+Files are generated on first use under benchmarks/fixtures/ and are the same
+on every run, so results can be compared across commits.
+
+    python benchmarks/fixtures.py          # generate everything
+"""
+
+import math
+import os
+import sys
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "exercises"))
+from joints import HAND, HAND_LANDMARK_NAMES, POSE, POSE_LANDMARK_NAMES  # noqa: E402
+from landmark_trace import TraceWriter  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SIZE = (640, 480)
+FPS = 30
+START_TIME = 1_700_000_000.0
+
+# Standing person facing the camera, in pixels of a 640x480 mirrored view
+STANDING = {
+    "NOSE": (320, 96), "LEFT_EYE_INNER": (326, 88), "LEFT_EYE": (331, 88), "LEFT_EYE_OUTER": (336, 88),
+    "RIGHT_EYE_INNER": (314, 88), "RIGHT_EYE": (309, 88), "RIGHT_EYE_OUTER": (304, 88),
+    "LEFT_EAR": (342, 94), "RIGHT_EAR": (298, 94), "MOUTH_LEFT": (327, 108), "MOUTH_RIGHT": (313, 108),
+    "LEFT_SHOULDER": (371, 154), "RIGHT_SHOULDER": (269, 154),
+    "LEFT_ELBOW": (384, 216), "RIGHT_ELBOW": (256, 216),
+    "LEFT_WRIST": (390, 274), "RIGHT_WRIST": (250, 274),
+    "LEFT_PINKY": (394, 286), "RIGHT_PINKY": (246, 286), "LEFT_INDEX": (391, 289), "RIGHT_INDEX": (249, 289),
+    "LEFT_THUMB": (386, 284), "RIGHT_THUMB": (254, 284),
+    "LEFT_HIP": (352, 278), "RIGHT_HIP": (288, 278),
+    "LEFT_KNEE": (355, 360), "RIGHT_KNEE": (285, 360),
+    "LEFT_ANKLE": (358, 442), "RIGHT_ANKLE": (282, 442),
+    "LEFT_HEEL": (356, 452), "RIGHT_HEEL": (284, 452),
+    "LEFT_FOOT_INDEX": (366, 462), "RIGHT_FOOT_INDEX": (274, 462),
+}
+
+
+def _standing():
+    points = np.zeros((len(POSE_LANDMARK_NAMES), 4), dtype=np.float64)
+    for name, xy in STANDING.items():
+        points[POSE[name], :2] = xy
+    points[:, 3] = 0.99
+    return points
+
+
+def _swing(t, period):
+    """0 -> 1 -> 0 once per period, starting at 0."""
+    return (1 - math.cos(2 * math.pi * t / period)) / 2
+
+
+def _rotate(points, names, pivot, degrees):
+    a = math.radians(degrees)
+    c, s = math.cos(a), math.sin(a)
+    for name in names:
+        d = points[POSE[name], :2] - pivot
+        points[POSE[name], :2] = pivot + (c * d[0] - s * d[1], s * d[0] + c * d[1])
+
+
+def squats(t):
+    p = _standing()
+    s = _swing(t, 2.5)
+    for side, out in (("LEFT", 1), ("RIGHT", -1)):
+        hip, knee, ankle = (POSE[f"{side}_{j}"] for j in ("HIP", "KNEE", "ANKLE"))
+        # Hips sink while the knees push out, closing the knee angle to ~75 degrees
+        p[knee, 0] += out * 70 * s
+        p[hip, 1] += 50 * s
+    for name in POSE_LANDMARK_NAMES[:23]:
+        p[POSE[name], 1] += 50 * s
+    return p
+
+
+def bicep_curl(side):
+    arm = ("WRIST", "PINKY", "INDEX", "THUMB")
+
+    def motion(t):
+        p = _standing()
+        elbow = p[POSE[f"{side}_ELBOW"], :2].copy()
+        direction = -1 if side == "LEFT" else 1
+        _rotate(p, [f"{side}_{j}" for j in arm], elbow, direction * 155 * _swing(t, 2.5))
+        return p
+    return motion
+
+
+def bicep_curls(t):
+    """Both arms curling, the right half a rep behind the left."""
+    p = bicep_curl("LEFT")(t)
+    right = bicep_curl("RIGHT")(t + 1.25)
+    for j in ("WRIST", "PINKY", "INDEX", "THUMB"):
+        p[POSE[f"RIGHT_{j}"]] = right[POSE[f"RIGHT_{j}"]]
+    return p
+
+
+def shoulder_shrugs(t):
+    p = _standing()
+    # Calibration samples rest until 5s and the shrug until 10s; leave a margin either side
+    if t < 5.5:
+        lift = 0.0
+    elif t < 10.5:
+        lift = 1.0
+    elif t < 11.0:
+        lift = 0.0
+    else:
+        lift = min(1.0, 1.6 * _swing(t - 11, 2.5))
+    for name in POSE_LANDMARK_NAMES[11:23]:
+        p[POSE[name], 1] -= 40 * lift
+    return p
+
+
+def neck_rotation(t):
+    p = _standing()
+    if t < 5:
+        offset = 0.0
+    elif t < 10:
+        offset = -60.0
+    elif t < 15:
+        offset = 60.0
+    else:
+        offset = 60 * math.sin(2 * math.pi * (t - 15) / 4)
+    for name in POSE_LANDMARK_NAMES[:11]:
+        p[POSE[name], 0] += offset
+    return p
+
+
+def tree_pose(bent):
+    straight = "LEFT" if bent == "RIGHT" else "RIGHT"
+
+    def motion(t):
+        p = _standing()
+        s = min(1.0, max(0.0, (t - 2) / 1.5))
+        hip = p[POSE[f"{bent}_HIP"], :2]
+        # Knee out to the side, foot resting against the standing knee
+        knee_target = hip + ((-70 if bent == "RIGHT" else 70), 60)
+        ankle_target = p[POSE[f"{straight}_KNEE"], :2] + ((-12 if bent == "RIGHT" else 12), 10)
+        for joint, target in (("KNEE", knee_target), ("ANKLE", ankle_target),
+                              ("HEEL", ankle_target + (0, 8)), ("FOOT_INDEX", ankle_target + (0, 14))):
+            i = POSE[f"{bent}_{joint}"]
+            p[i, :2] += s * (target - p[i, :2])
+        return p
+    return motion
+
+
+def wrist_curl(t):
+    p = np.zeros((len(HAND_LANDMARK_NAMES), 4), dtype=np.float64)
+    wrist = np.array((300.0, 300.0))
+    curl = math.radians(-70 * _swing(t, 2.0))
+    p[HAND["WRIST"], :2] = wrist
+    fingers = (("THUMB", ("CMC", "MCP", "IP", "TIP"), -0.6),
+               ("INDEX_FINGER", ("MCP", "PIP", "DIP", "TIP"), -0.2),
+               ("MIDDLE_FINGER", ("MCP", "PIP", "DIP", "TIP"), 0.0),
+               ("RING_FINGER", ("MCP", "PIP", "DIP", "TIP"), 0.2),
+               ("PINKY", ("MCP", "PIP", "DIP", "TIP"), 0.4))
+    for finger, joints, spread in fingers:
+        for k, joint in enumerate(joints):
+            r = 40 + 22 * k
+            a = curl + 0.25 + spread * 0.5
+            p[HAND[f"{finger}_{joint}"], :2] = wrist + (r * math.cos(a), r * math.sin(a) + spread * 30)
+    return p
+
+
+# name -> (motion, seconds, expected reps, or expected "done" for holds)
+CASES = {
+    "squats": (squats, 30.0, 12),
+    "bicep_curl_left": (bicep_curl("LEFT"), 30.0, 12),
+    "bicep_curl_right": (bicep_curl("RIGHT"), 30.0, 12),
+    "bicep_curls": (bicep_curls, 30.0, 24),
+    "shoulder_shrugs": (shoulder_shrugs, 40.0, 11),
+    "neck_rotation": (neck_rotation, 45.0, 15),
+    "wrist_curls": (wrist_curl, 30.0, 15),
+    "tree_pose_left": (tree_pose("RIGHT"), 65.0, "done"),
+}
+
+
+def trace_path(name):
+    return os.path.join(FIXTURE_DIR, f"{name}.fdt")
+
+
+def video_path(name, seconds=10.0):
+    suffix = "" if seconds == 10.0 else f"-{seconds:g}s"
+    return os.path.join(FIXTURE_DIR, f"{name}{suffix}.avi")
+
+
+def frames(name, seconds=None):
+    """(time, pixel landmarks) for every frame of a case, jitter included."""
+    motion, length, _ = CASES[name]
+    rng = np.random.default_rng(sum(map(ord, name)))
+    for i in range(int((seconds or length) * FPS)):
+        t = i / FPS
+        points = motion(t)
+        points[:, :2] += rng.normal(0.0, 0.6, (len(points), 2))
+        yield t, points
+
+
+def fixture_trace(name):
+    """Path of the case's landmark trace, generating it on first use."""
+    path = trace_path(name)
+    if os.path.exists(path):
+        return path
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    w, h = SIZE
+    num_landmarks = len(CASES[name][0](0.0))
+    with TraceWriter(path + ".tmp", SIZE, num_landmarks, start_time=START_TIME) as writer:
+        for t, points in frames(name):
+            normalized = points.astype(np.float32)
+            normalized[:, 0] /= w
+            normalized[:, 1] /= h
+            writer.write(START_TIME + t, normalized)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+LIMBS = (
+    ("LEFT_SHOULDER", "RIGHT_SHOULDER", 16), ("LEFT_HIP", "RIGHT_HIP", 16),
+    ("LEFT_SHOULDER", "LEFT_HIP", 30), ("RIGHT_SHOULDER", "RIGHT_HIP", 30),
+    ("LEFT_SHOULDER", "LEFT_ELBOW", 16), ("LEFT_ELBOW", "LEFT_WRIST", 14),
+    ("RIGHT_SHOULDER", "RIGHT_ELBOW", 16), ("RIGHT_ELBOW", "RIGHT_WRIST", 14),
+    ("LEFT_HIP", "LEFT_KNEE", 22), ("LEFT_KNEE", "LEFT_ANKLE", 18),
+    ("RIGHT_HIP", "RIGHT_KNEE", 22), ("RIGHT_KNEE", "RIGHT_ANKLE", 18),
+    ("LEFT_ANKLE", "LEFT_FOOT_INDEX", 10), ("RIGHT_ANKLE", "RIGHT_FOOT_INDEX", 10),
+)
+
+
+def render(points, frame):
+    """Draws a pose as a filled stick figure over a plain backdrop."""
+    frame[:] = (200, 205, 210)
+    frame[int(SIZE[1] * 0.8):] = (120, 130, 140)
+    torso = np.array([points[POSE[n], :2] for n in
+                      ("LEFT_SHOULDER", "RIGHT_SHOULDER", "RIGHT_HIP", "LEFT_HIP")], dtype=np.int32)
+    cv2.fillConvexPoly(frame, torso, (60, 70, 150))
+    for a, b, width in LIMBS:
+        pa = tuple(int(v) for v in points[POSE[a], :2])
+        pb = tuple(int(v) for v in points[POSE[b], :2])
+        cv2.line(frame, pa, pb, (90, 120, 180) if width < 20 else (70, 60, 50), width, cv2.LINE_AA)
+    nose = points[POSE["NOSE"], :2]
+    cv2.ellipse(frame, (int(nose[0]), int(nose[1]) - 8), (26, 34), 0, 0, 360, (150, 180, 220), -1, cv2.LINE_AA)
+    return frame
+
+
+def fixture_video(name="squats", seconds=10.0):
+    """Path of a rendered video of the case, generating it on first use.
+
+    Frame i shows the pose of the trace's frame i, unmirrored; pass the case's
+    full length as `seconds` to get every rep.
+    """
+    path = video_path(name, seconds)
+    if os.path.exists(path):
+        return path
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    writer = cv2.VideoWriter(path + ".tmp.avi", cv2.VideoWriter_fourcc(*"MJPG"), FPS, SIZE)
+    frame = np.empty((SIZE[1], SIZE[0], 3), dtype=np.uint8)
+    for _, points in frames(name, seconds):
+        # The trace is a mirrored view; the camera sees the person unmirrored
+        points[:, 0] = SIZE[0] - points[:, 0]
+        writer.write(render(points, frame))
+    writer.release()
+    os.replace(path + ".tmp.avi", path)
+    return path
+
+
+if __name__ == "__main__":
+    for name in CASES:
+        print(fixture_trace(name))
+    print(fixture_video())
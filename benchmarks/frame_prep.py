@@ -0,0 +1,71 @@
+"""Micro-benchmark for the per-frame flip and colour conversion in the trackers.
+
+Compares the original path (cv2.flip then cv2.cvtColor, each allocating a new
+full-size frame) with frames.FramePrep, which mirrors for display and converts
+for the model into reused buffers.
+
+    python benchmarks/frame_prep.py [--frames 300]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "exercises"))
+from frames import FramePrep  # noqa: E402
+
+RESOLUTIONS = {"720p": (1280, 720), "1080p": (1920, 1080)}
+
+
+def original_path(frame, prep):
+    frame = cv2.flip(frame, 1)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+
+def prep_path(frame, prep):
+    rgb = prep.rgb(frame)
+    prep.display(frame)
+    return rgb
+
+
+def measure(path, frame, frames):
+    prep = FramePrep()
+    path(frame, prep)  # let reused buffers be allocated once
+
+    tracemalloc.start()
+    allocated = 0
+    for _ in range(frames):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        path(frame, prep)
+        allocated += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        path(frame, prep)
+    elapsed = time.perf_counter() - start
+    return allocated / frames, elapsed / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'resolution':<10} {'path':<10} {'MB/frame':>9} {'frames/frame':>13} {'ms/frame':>9}")
+    for name, (w, h) in RESOLUTIONS.items():
+        frame = rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+        for label, path in (("original", original_path), ("prep", prep_path)):
+            allocated, ms = measure(path, frame, args.frames)
+            print(f"{name:<10} {label:<10} {allocated / 1e6:>9.2f} {allocated / frame.nbytes:>13.2f} {ms:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
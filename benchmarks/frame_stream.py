@@ -0,0 +1,111 @@
+"""Loopback benchmark for streaming annotated frames to the web page.
+
+A tracking loop with a stand-in for inference pushes frames through
+stream.FrameStreamer while a separate reader process plays the browser,
+polling FrameReader and decoding every new JPEG. The loop is timed with
+and without streaming to show what encoding costs the tracker.
+
+    python benchmarks/frame_stream.py [--seconds 5] [--resolution 720p] [--fps 15]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "exercises"))
+from stream import FrameReader, FrameStreamer  # noqa: E402
+
+RESOLUTIONS = {"480p": (640, 480), "720p": (1280, 720), "1080p": (1920, 1080)}
+
+
+def fake_inference(frame, work):
+    # Roughly the cost of a pose model call, spent in native code like the real one
+    cv2.GaussianBlur(frame, (31, 31), 0, dst=work)
+
+
+def annotated_frames(w, h, count=30):
+    rng = np.random.default_rng(0)
+    base = cv2.GaussianBlur(rng.integers(0, 256, (h, w, 3), dtype=np.uint8), (0, 0), 8)
+    frames = []
+    for i in range(count):
+        frame = np.roll(base, i * 8, axis=1).copy()
+        cv2.putText(frame, f"Reps: {i}/10", (50, h - 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+        cv2.circle(frame, (w // 2 + 5 * i, h // 2), 8, (255, 0, 255), -1)
+        frames.append(frame)
+    return frames
+
+
+def browser(run_dir, seconds, poll_hz, results):
+    reader = FrameReader("bench", run_dir)
+    seen, received, nbytes = None, 0, 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        frame = reader.read()
+        if frame is not None and frame.seq != seen:
+            seen = frame.seq
+            image = cv2.imdecode(np.frombuffer(frame.jpeg, np.uint8), cv2.IMREAD_COLOR)
+            if image is not None:
+                received += 1
+                nbytes += len(frame.jpeg)
+        time.sleep(1.0 / poll_hz)
+    results.put((received, nbytes))
+
+
+def tracking_loop(frames, seconds, streamer=None):
+    work = np.empty_like(frames[0])
+    push_times = []
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        frame = frames[count % len(frames)]
+        fake_inference(frame, work)
+        if streamer is not None:
+            t = time.perf_counter()
+            streamer.push(frame)
+            push_times.append(time.perf_counter() - t)
+        count += 1
+    return count / (time.perf_counter() - start), push_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--resolution", choices=RESOLUTIONS, default="720p")
+    parser.add_argument("--fps", type=int, default=15, help="stream rate cap")
+    parser.add_argument("--poll", type=int, default=30, help="reader polls per second")
+    args = parser.parse_args()
+
+    w, h = RESOLUTIONS[args.resolution]
+    frames = annotated_frames(w, h)
+
+    baseline, _ = tracking_loop(frames, args.seconds)
+
+    with tempfile.TemporaryDirectory() as run_dir:
+        streamer = FrameStreamer("bench", max_fps=args.fps, run_dir=run_dir)
+        results = multiprocessing.Queue()
+        reader = multiprocessing.Process(target=browser, args=(run_dir, args.seconds + 0.5, args.poll, results))
+        reader.start()
+        streamed, push_times = tracking_loop(frames, args.seconds, streamer)
+        received, nbytes = results.get()
+        reader.join()
+        stats = streamer.stats()
+        streamer.close()
+
+    push_us = np.array(push_times) * 1e6
+    print(f"resolution {args.resolution}, stream cap {args.fps} fps, {args.seconds:.0f}s")
+    print(f"tracking loop       {baseline:8.1f} fps without streaming, {streamed:.1f} fps with")
+    print(f"push()              p50 {np.percentile(push_us, 50):.1f} us, p99 {np.percentile(push_us, 99):.1f} us")
+    print(f"encoder             {stats['encoded']} encoded, {stats['dropped']} dropped while busy, "
+          f"last {stats['encode_ms']:.1f} ms at quality {stats['quality']}, width {stats['width']}")
+    print(f"reader              {received / args.seconds:8.1f} fps decoded, "
+          f"{nbytes / args.seconds / 1e6:.2f} MB/s, {nbytes / max(received, 1) / 1e3:.1f} kB/frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Compares full-frame hand tracking with hands seeded from the pose wrist.
+
+    full    hands.process on every full RGB frame, as wrist_curls ran before,
+            with palm detection on every frame the hand isn't tracked
+    seeded  roi.PoseSeededHands: pose every `--pose-stride` frames while the
+            hand is lost, hands only on a crop around the wrist
+
+Both run on the same clip and report latency p50/p95, throughput, the share
+of frames with a hand, how often each model ran and, on frames where both
+found a hand, how far apart their wrists are. Latency is also split by what
+ran on each frame (tracking or palm detection for full; pose, hands on the
+crop, hands on the full frame or nothing for seeded), since the totals
+depend on how often the hand is lost.
+
+The clip must be a recording with a hand in it, e.g. of wrist curls: the
+rendered fixtures don't show a hand MediaPipe detects. On a clip where
+neither path finds a hand only the lost-hand case would be measured, so
+nothing is compared or written.
+
+    python benchmarks/hand_seed.py --video PATH [--pose-stride 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "exercises"))
+from pipeline import RESULTS_DIR, environment  # noqa: E402
+
+WARMUP_FRAMES = 5
+
+
+def _hands():
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=1, model_complexity=1,
+                                    min_detection_confidence=0.5, min_tracking_confidence=0.5)
+
+
+def full_path():
+    hands = _hands()
+    rgb = None
+
+    def process(frame):
+        nonlocal rgb
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+        return hands.process(rgb)
+    return process, hands, None
+
+
+def seeded_path(pose_stride):
+    import mediapipe as mp
+    from roi import PoseSeededHands
+    pose = mp.solutions.pose.Pose(model_complexity=1, min_detection_confidence=0.5,
+                                  min_tracking_confidence=0.5)
+    model = PoseSeededHands(_hands(), pose, pose_stride=pose_stride)
+    return model.process, model, model.runs
+
+
+def _ran(runs, before, tracked):
+    """What ran on the last frame: the PoseSeededHands stages, or for full whether it tracked."""
+    if runs is None:
+        return "tracking" if tracked else "palm detection"
+    ran = [name for name in ("pose", "hands_crop", "hands_full") if runs[name] > before[name]]
+    return "+".join(ran) or "nothing"
+
+
+def measure(path, video):
+    process, model, runs = path
+    cap = cv2.VideoCapture(video)
+    latencies, wrists, by_stage = [], [], {}
+    index = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        before = None if runs is None else dict(runs)
+        start = time.perf_counter()
+        results = process(frame)
+        elapsed = time.perf_counter() - start
+        stage = _ran(runs, before, bool(wrists) and wrists[-1] is not None)
+        hand = results.multi_hand_landmarks[0] if results.multi_hand_landmarks else None
+        wrists.append(None if hand is None else
+                      (hand.landmark[0].x * frame.shape[1], hand.landmark[0].y * frame.shape[0]))
+        if index >= WARMUP_FRAMES:
+            latencies.append(elapsed)
+            by_stage.setdefault(stage, []).append(elapsed)
+        index += 1
+    cap.release()
+    model.close()
+
+    latencies = np.asarray(latencies)
+    found = sum(w is not None for w in wrists[WARMUP_FRAMES:])
+    result = {"frames": len(latencies),
+              "p50_ms": float(np.percentile(latencies, 50) * 1e3),
+              "p95_ms": float(np.percentile(latencies, 95) * 1e3),
+              "fps": float(len(latencies) / latencies.sum()),
+              "detected": found / len(latencies),
+              "stages": {stage: {"frames": len(times),
+                                 "mean_ms": float(np.mean(times) * 1e3),
+                                 "p50_ms": float(np.percentile(times, 50) * 1e3)}
+                         for stage, times in sorted(by_stage.items())}}
+    if runs is not None:
+        result["runs"] = dict(runs)
+    return result, wrists
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--video", required=True, help="recording with a hand in it to run on")
+    parser.add_argument("--pose-stride", type=int, default=5,
+                        help="frames between pose runs while the hand is lost")
+    parser.add_argument("--out", help="results file (default: benchmarks/results/hand_seed-<commit>.json)")
+    args = parser.parse_args()
+
+    video = args.video
+    env = environment()
+    full, full_wrists = measure(full_path(), video)
+    seeded, seeded_wrists = measure(seeded_path(args.pose_stride), video)
+    if not full["detected"] and not seeded["detected"]:
+        sys.exit(f"No hand found in {video} by either path, so hand tracking can't be compared")
+    both = [np.hypot(a[0] - b[0], a[1] - b[1]) for a, b in zip(full_wrists, seeded_wrists)
+            if a is not None and b is not None]
+    seeded["wrist_distance_px"] = float(np.mean(both)) if both else None
+
+    print(f"{'path':<8} {'p50 ms':>7} {'p95 ms':>7} {'fps':>7} {'found':>6}  runs")
+    for name, result in (("full", full), ("seeded", seeded)):
+        print(f"{name:<8} {result['p50_ms']:>7.1f} {result['p95_ms']:>7.1f} {result['fps']:>7.0f} "
+              f"{result['detected']:>6.0%}  {result.get('runs', '')}")
+    print(f"\n{'path':<8} {'ran':<16} {'frames':>6} {'mean ms':>8} {'p50 ms':>7}")
+    for name, result in (("full", full), ("seeded", seeded)):
+        for stage, times in result["stages"].items():
+            print(f"{name:<8} {stage:<16} {times['frames']:>6} {times['mean_ms']:>8.1f} "
+                  f"{times['p50_ms']:>7.1f}")
+    if both:
+        print(f"wrists {seeded['wrist_distance_px']:.1f}px apart on {len(both)} frames found by both")
+
+    out = args.out or os.path.join(RESULTS_DIR, f"hand_seed-{env['commit'] or 'results'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({"environment": env, "video": video, "pose_stride": args.pose_stride,
+                   "cases": {"full": full, "seeded": seeded}}, f, indent=2)
+    print(f"\nwrote {out}")
+
+
+if __name__ == "__main__":
+    main()
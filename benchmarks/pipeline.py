@@ -0,0 +1,345 @@
+"""Benchmark suite for the tracking pipeline.
+
+Runs the real exercise logic over the deterministic fixtures in fixtures.py,
+with no window and no speech, and reports per-stage and end-to-end frame
+rates, peak RSS and allocations, and for the engine cases the session's
+startup milestones (kept out of the frame rates). Every case runs in a fresh
+process so its peak RSS and startup are its own.
+
+    logic/<exercise>   metrics and rep logic straight from the trace array
+    engine/<exercise>  engine.run() replaying the trace, every loop stage timed
+    headless/<exercise> the same in headless mode, without mirroring or drawing
+    video/squats       engine.run() on a rendered video with the real models
+    stride/<exercise>  rep logic behind scheduler.AdaptiveInference on the
+                       rendered video, the trace standing in for the model, so
+                       skipped inferences must not cost any reps
+
+Results are written as JSON (by default benchmarks/results/<commit>.json) and
+can be compared with an earlier run:
+
+    python benchmarks/pipeline.py [--cases logic engine] [--compare OLD.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "exercises"))
+import fixtures  # noqa: E402
+from specs import EXERCISES  # noqa: E402
+
+RESULTS_DIR = os.path.join(HERE, "results")
+ALLOC_FRAMES = 300
+CASE_TIMEOUT = 600.0
+# How much faster than the fixtures the stride cases make the reps
+SPEEDUP = 2
+
+
+class _NullDisplay:
+    def show(self, title, frame):
+        return -1
+
+    def close(self):
+        pass
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def _checked(name, count, done):
+    expected = fixtures.CASES[name][2]
+    return {"reps": count, "done": done, "expected": expected,
+            "ok": done if expected == "done" else count == expected}
+
+
+def logic_case(name):
+    from engine import BilateralState, ExerciseState, MetricSet
+    from joints import HAND, POSE
+    from landmark_trace import TraceReader
+    from specs import EXERCISES
+
+    spec = EXERCISES[name]
+    sides = spec.get("sides")
+    trace = TraceReader(fixtures.fixture_trace(name))
+    times = trace.timestamps()
+    landmarks = np.ascontiguousarray(trace.landmarks)
+    size = trace.frame_size
+    metrics = MetricSet(list(sides.values()) if sides else [spec], HAND if spec["model"] == "hands" else POSE)
+
+    def evaluate(i):
+        values = metrics.evaluate(landmarks[i], size)
+        return values if sides else values[0]
+
+    def new_state():
+        return BilateralState(spec, target=0) if sides else ExerciseState(spec, target=0)
+
+    def step(state, i):
+        state.update(evaluate(i), times[i])
+
+    # Allocations per frame, measured on a separate pass since tracing slows everything down
+    state = new_state()
+    step(state, 0)
+    tracemalloc.start()
+    allocated = 0
+    frames = min(ALLOC_FRAMES, len(trace))
+    for i in range(1, frames):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        step(state, i)
+        allocated += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+
+    state = new_state()
+    metrics_time = logic_time = 0.0
+    start = time.perf_counter()
+    for i in range(len(trace)):
+        t0 = time.perf_counter()
+        values = evaluate(i)
+        t1 = time.perf_counter()
+        state.update(values, times[i])
+        metrics_time += t1 - t0
+        logic_time += time.perf_counter() - t1
+    elapsed = time.perf_counter() - start
+
+    n = len(trace)
+    return {"frames": n, "fps": n / elapsed,
+            "stages": {"metrics": {"fps": n / metrics_time}, "logic": {"fps": n / logic_time}},
+            "alloc_bytes_per_frame": allocated / max(frames - 1, 1),
+            **_checked(name, state.count, state.done)}
+
+
+class _TraceRows:
+    """Stands in for the pose model: answers with the trace row of the frame it was given."""
+
+    def __init__(self):
+        self.row = 0
+
+    def process(self, image):
+        return self.row
+
+    def close(self):
+        pass
+
+
+def stride_case(name):
+    import cv2
+    from engine import BilateralState, ExerciseState, MetricSet
+    from joints import POSE
+    from landmark_trace import TraceReader
+    from scheduler import AdaptiveInference
+
+    spec = EXERCISES[name]
+    sides = spec.get("sides")
+    # A hold sped up would just be too short
+    speed = 1 if spec.get("hold") else SPEEDUP
+    trace = TraceReader(fixtures.fixture_trace(name))
+    times = trace.timestamps()
+    landmarks = np.ascontiguousarray(trace.landmarks)
+    metrics = MetricSet(list(sides.values()) if sides else [spec], POSE)
+    state = BilateralState(spec, target=0) if sides else ExerciseState(spec, target=0)
+    rows = _TraceRows()
+    model = AdaptiveInference(rows)
+    cap = cv2.VideoCapture(fixtures.fixture_video(name, fixtures.CASES[name][1]))
+
+    # Calibration runs at normal speed, the reps `speed` times faster: only
+    # every `speed`-th frame is shown, as if the user moved that much quicker
+    calibrated = None
+    index = frames = max_lag = 0
+    scheduler_time = 0.0
+    start = time.perf_counter()
+    while index < len(trace):
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if calibrated is None and not state.calibrating:
+            calibrated = index
+        if calibrated is not None and (index - calibrated) % speed:
+            index += 1
+            continue
+        rows.row = index
+        t0 = time.perf_counter()
+        row = model.process(frame)
+        scheduler_time += time.perf_counter() - t0
+        max_lag = max(max_lag, index - row)
+        values = metrics.evaluate(landmarks[row], trace.frame_size)
+        clock = times[index] if calibrated is None else times[calibrated] + (times[index] - times[calibrated]) / speed
+        state.update(values if sides else values[0], clock)
+        index += 1
+        frames += 1
+    elapsed = time.perf_counter() - start
+    cap.release()
+
+    return {"frames": frames, "fps": frames / elapsed, "speed": speed,
+            "stages": {"scheduler": {"fps": frames / scheduler_time}},
+            "inferred": model.inferences / max(frames, 1), "max_lag_frames": max_lag // speed,
+            **_checked(name, state.count, state.done)}
+
+
+def _engine_run(name, source, headless=False):
+    from engine import Session, run
+    from profiler import Profiler
+    from specs import EXERCISES
+    from speech import SilentSpeech
+
+    session = Session(source, speech=SilentSpeech())
+    # Startup (imports, model construction) is reported separately from the loop
+    session.warm([EXERCISES[name]])
+    startup = session.startup_report()
+    profiler = Profiler(window=100_000)
+    start = time.perf_counter()
+    count = run(name, reps=0, session=session, display=_NullDisplay(), profiler=profiler,
+                headless=headless)
+    elapsed = time.perf_counter() - start
+    session.close()
+
+    stats = profiler.stats()
+    stages = {stage: {"fps": 1e3 / s["mean_ms"], "mean_ms": s["mean_ms"], "p50_ms": s["p50_ms"],
+                      "p95_ms": s["p95_ms"], "p99_ms": s["p99_ms"]}
+              for stage, s in stats.items() if stage != "frame"}
+    return {"frames": profiler.frames, "fps": profiler.frames / elapsed, "stages": stages, "reps": count,
+            "startup": startup}
+
+
+def engine_case(name):
+    result = _engine_run(name, fixtures.fixture_trace(name))
+    # run() only returns the count, so holds are checked by the logic case alone
+    result.update(_checked(name, result["reps"], None))
+    return result
+
+
+def headless_case(name):
+    result = _engine_run(name, fixtures.fixture_trace(name), headless=True)
+    result.update(_checked(name, result["reps"], None))
+    return result
+
+
+def video_case(name):
+    return _engine_run(name, fixtures.fixture_video(name))
+
+
+CASES = {}
+for _name in fixtures.CASES:
+    CASES[f"logic/{_name}"] = (logic_case, _name)
+    CASES[f"engine/{_name}"] = (engine_case, _name)
+    CASES[f"headless/{_name}"] = (headless_case, _name)
+CASES["video/squats"] = (video_case, "squats")
+for _name in fixtures.CASES:
+    # Only the pose model runs behind the scheduler
+    if EXERCISES[_name]["model"] == "pose":
+        CASES[f"stride/{_name}"] = (stride_case, _name)
+
+
+def _run_case(case, results):
+    func, name = CASES[case]
+    try:
+        result = func(name)
+    except Exception as e:
+        result = {"error": f"{type(e).__name__}: {e}"}
+    result["peak_rss_mb"] = _peak_rss_mb()
+    results.put(result)
+
+
+def run_isolated(case, timeout=CASE_TIMEOUT):
+    """Runs one case in a fresh process; a case that hangs or dies is recorded as an error."""
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    process = ctx.Process(target=_run_case, args=(case, results))
+    process.start()
+    deadline = time.perf_counter() + timeout
+    result = None
+    while result is None:
+        try:
+            result = results.get(timeout=1.0)
+        except queue.Empty:
+            if not process.is_alive() and results.empty():
+                result = {"error": f"process exited with code {process.exitcode}"}
+            elif time.perf_counter() > deadline:
+                result = {"error": f"timed out after {timeout:.0f}s"}
+                process.terminate()
+    process.join(5.0)
+    if process.is_alive():
+        process.kill()
+        process.join()
+    return result
+
+
+def environment():
+    import cv2
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    try:
+        import mediapipe
+        mediapipe_version = mediapipe.__version__
+    except ImportError:
+        mediapipe_version = None
+    return {"commit": commit, "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(), "platform": platform.platform(),
+            "machine": platform.machine(), "cpus": os.cpu_count(),
+            "numpy": np.__version__, "opencv": cv2.__version__, "mediapipe": mediapipe_version}
+
+
+def compare(results, old):
+    print(f"\ncompared with {old['environment'].get('commit')}:")
+    for case, result in results.items():
+        before = old["cases"].get(case, {}).get("fps")
+        if before and result.get("fps"):
+            print(f"{case:<30} {before:>10.0f} -> {result['fps']:>10.0f} fps ({result['fps'] / before - 1:+.1%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", nargs="*", default=["logic", "engine", "headless", "video", "stride"],
+                        help="case names or prefixes (logic, engine, headless, video, stride)")
+    parser.add_argument("--out", help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare against")
+    parser.add_argument("--timeout", type=float, default=CASE_TIMEOUT,
+                        help="seconds a case may run before it is stopped and recorded as failed")
+    args = parser.parse_args()
+
+    selected = [case for case in CASES
+                if any(case == c or case.startswith(c.rstrip("/") + "/") for c in args.cases)]
+    env = environment()
+    results = {}
+    print(f"{'case':<30} {'fps':>10} {'peak MB':>8} {'alloc B/f':>10}  reps")
+    for case in selected:
+        result = run_isolated(case, args.timeout)
+        results[case] = result
+        if "error" in result:
+            print(f"{case:<30} error: {result['error']}")
+            continue
+        alloc = result.get("alloc_bytes_per_frame")
+        check = {True: "ok", False: "MISMATCH", None: ""}[result.get("ok")]
+        print(f"{case:<30} {result['fps']:>10.0f} {result['peak_rss_mb']:>8.0f} "
+              f"{'' if alloc is None else f'{alloc:.0f}':>10}  {result.get('reps', '')} {check}")
+        for stage, s in result["stages"].items():
+            print(f"  {stage:<28} {s['fps']:>10.0f}")
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{env['commit'] or 'results'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({"environment": env, "cases": results}, f, indent=2)
+    print(f"\nwrote {out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Compares pose backends (exercises/backends.py) on the same fixture clips.
+
+Every backend runs on every frame of the rendered fixture videos, straight
+from the decoded frame with no ROI or frame skipping, and reports its
+inference latency (p50/p95), throughput, the share of frames it found the
+person in and its mean error in pixels against the fixture's ground truth on
+the shoulders, elbows, wrists, hips, knees and ankles. Each backend runs in
+a fresh process so its peak RSS is its own.
+
+    python benchmarks/pose_backends.py [--backends mediapipe mediapipe:0 movenet:PATH]
+                                       [--clips squats] [--out results.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "exercises"))
+import fixtures  # noqa: E402
+from pipeline import RESULTS_DIR, _peak_rss_mb, environment  # noqa: E402
+
+CORE = ("SHOULDER", "ELBOW", "WRIST", "HIP", "KNEE", "ANKLE")
+WARMUP_FRAMES = 5
+
+
+def _joint_error(points, truth, size):
+    """Mean pixel error over the core joints; sides are matched either way round."""
+    from joints import POSE
+    w, h = size
+    errors = []
+    for joint in CORE:
+        left, right = POSE["LEFT_" + joint], POSE["RIGHT_" + joint]
+        found = points[[left, right], :2] * (w, h)
+        expected = truth[[left, right], :2]
+        same = np.linalg.norm(found - expected, axis=1)
+        swapped = np.linalg.norm(found[::-1] - expected, axis=1)
+        errors.extend(same if np.nansum(same) <= np.nansum(swapped) else swapped)
+    errors = np.asarray(errors)
+    errors = errors[~np.isnan(errors)]
+    return float(errors.mean()) if len(errors) else None
+
+
+def backend_case(spec):
+    backend_name, clip = spec
+    from backends import make_backend
+
+    load_start = time.perf_counter()
+    backend = make_backend(backend_name)
+    load = time.perf_counter() - load_start
+
+    cap = cv2.VideoCapture(fixtures.fixture_video(clip))
+    truth = []
+    for _, points in fixtures.frames(clip, 10.0):
+        points[:, 0] = fixtures.SIZE[0] - points[:, 0]  # the video is unmirrored
+        truth.append(points)
+    rgb = None
+    latencies, errors = [], []
+    detected = 0
+    index = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+        start = time.perf_counter()
+        points = backend.process(rgb)
+        elapsed = time.perf_counter() - start
+        if index >= WARMUP_FRAMES:
+            latencies.append(elapsed)
+            if points is not None:
+                detected += 1
+                error = _joint_error(points, truth[index], fixtures.SIZE)
+                if error is not None:
+                    errors.append(error)
+        index += 1
+    cap.release()
+    backend.close()
+
+    latencies = np.asarray(latencies)
+    return {"backend": backend_name, "clip": clip, "frames": len(latencies), "load_s": load,
+            "p50_ms": float(np.percentile(latencies, 50) * 1e3),
+            "p95_ms": float(np.percentile(latencies, 95) * 1e3),
+            "fps": float(len(latencies) / latencies.sum()),
+            "detected": detected / len(latencies),
+            "error_px": float(np.mean(errors)) if errors else None}
+
+
+def _run_case(spec, results):
+    try:
+        result = backend_case(spec)
+    except Exception as e:
+        result = {"error": f"{type(e).__name__}: {e}"}
+    result["peak_rss_mb"] = _peak_rss_mb()
+    results.put(result)
+
+
+def run_isolated(spec):
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    process = ctx.Process(target=_run_case, args=(spec, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="*", default=["mediapipe", "mediapipe:0"],
+                        help="backend names, e.g. mediapipe, mediapipe:0, movenet:models/movenet.onnx")
+    parser.add_argument("--clips", nargs="*", default=["squats"], help="fixture cases to render and run")
+    parser.add_argument("--out", help="results file (default: benchmarks/results/backends-<commit>.json)")
+    args = parser.parse_args()
+
+    env = environment()
+    results = {}
+    print(f"{'backend':<32} {'clip':<10} {'p50 ms':>7} {'p95 ms':>7} {'fps':>7} {'found':>6} {'err px':>7}")
+    for clip in args.clips:
+        for name in args.backends:
+            result = run_isolated((name, clip))
+            results[f"{name}/{clip}"] = result
+            if "error" in result:
+                print(f"{name:<32} {clip:<10} error: {result['error']}")
+                continue
+            error = result["error_px"]
+            print(f"{name:<32} {clip:<10} {result['p50_ms']:>7.1f} {result['p95_ms']:>7.1f} "
+                  f"{result['fps']:>7.0f} {result['detected']:>6.0%} "
+                  f"{'' if error is None else f'{error:.1f}':>7}")
+
+    out = args.out or os.path.join(RESULTS_DIR, f"backends-{env['commit'] or 'results'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({"environment": env, "cases": results}, f, indent=2)
+    print(f"\nwrote {out}")
+
+
+if __name__ == "__main__":
+    main()
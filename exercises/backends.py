@@ -0,0 +1,146 @@
+"""Pose backends: one interface over different landmark models.
+
+A backend's process(image) takes an RGB image and returns the landmarks as a
+float32 array of shape (len(POSE_LANDMARK_NAMES), 4), holding normalized x
+and y, z and visibility in the fixed joints.POSE order, or None when nobody
+is found. Joints a model doesn't detect are NaN with visibility 0.
+
+    mediapipe[:COMPLEXITY]   mediapipe Pose (the default)
+    movenet:PATH             a MoveNet single-pose model file (.onnx), run on
+                             ONNX Runtime if it is installed, else OpenCV DNN
+
+Trackers use mediapipe unless FITDESK_POSE_BACKEND names another backend;
+BackendModel puts any backend behind the same ROI, mirroring, motion and
+recording wrappers (see sources.load_model), so exercise logic is unchanged.
+benchmarks/pose_backends.py compares them on the fixture clips.
+"""
+
+import os
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from joints import POSE, POSE_LANDMARK_NAMES, array_to_landmarks, landmarks_to_array
+
+# MoveNet's 17 COCO keypoints, in model output order
+COCO_KEYPOINTS = (
+    "NOSE", "LEFT_EYE", "RIGHT_EYE", "LEFT_EAR", "RIGHT_EAR",
+    "LEFT_SHOULDER", "RIGHT_SHOULDER", "LEFT_ELBOW", "RIGHT_ELBOW", "LEFT_WRIST", "RIGHT_WRIST",
+    "LEFT_HIP", "RIGHT_HIP", "LEFT_KNEE", "RIGHT_KNEE", "LEFT_ANKLE", "RIGHT_ANKLE",
+)
+
+
+class MediaPipePose:
+    def __init__(self, complexity=1, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        import mediapipe as mp
+        self.pose = mp.solutions.pose.Pose(model_complexity=complexity,
+                                           min_detection_confidence=min_detection_confidence,
+                                           min_tracking_confidence=min_tracking_confidence)
+        self._points = None
+
+    def process(self, image):
+        results = self.pose.process(image)
+        if results.pose_landmarks is None:
+            return None
+        self._points = landmarks_to_array(results.pose_landmarks, self._points)
+        return self._points
+
+    def close(self):
+        self.pose.close()
+
+
+class MoveNet:
+    """MoveNet single-pose (Lightning or Thunder) from a local ONNX file.
+
+    The frame is letterboxed into the model's square input, so the person keeps
+    their proportions; keypoints scoring under `min_score` get visibility 0,
+    and a frame whose keypoints average under `min_score` counts as empty.
+    """
+
+    def __init__(self, path, min_score=0.3):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No MoveNet model at {path}")
+        self.min_score = min_score
+        try:
+            import onnxruntime
+        except ImportError:
+            onnxruntime = None
+        if onnxruntime is not None:
+            self._session = onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"])
+            model_input = self._session.get_inputs()[0]
+            self._input_name = model_input.name
+            self.size = model_input.shape[1] if isinstance(model_input.shape[1], int) else 192
+            self._dtype = np.int32 if "int32" in model_input.type else np.float32
+            self._net = None
+        else:
+            self._session = None
+            self._net = cv2.dnn.readNetFromONNX(path)
+            self.size = 192 if "lightning" in os.path.basename(path).lower() else 256
+            self._dtype = np.float32
+
+        self._canvas = np.zeros((self.size, self.size, 3), dtype=np.uint8)
+        self._index = np.array([POSE[name] for name in COCO_KEYPOINTS], dtype=np.intp)
+        self._points = np.full((len(POSE_LANDMARK_NAMES), 4), np.nan, dtype=np.float32)
+        self._points[:, 3] = 0.0
+
+    def process(self, image):
+        h, w = image.shape[:2]
+        scale = self.size / max(w, h)
+        rw, rh = round(w * scale), round(h * scale)
+        self._canvas.fill(0)
+        cv2.resize(image, (rw, rh), dst=self._canvas[:rh, :rw], interpolation=cv2.INTER_AREA)
+        batch = self._canvas[None].astype(self._dtype)
+        if self._session is not None:
+            output = self._session.run(None, {self._input_name: batch})[0]
+        else:
+            self._net.setInput(batch)
+            output = self._net.forward()
+        keypoints = output.reshape(-1, 3)[:len(COCO_KEYPOINTS)]  # y, x, score on the canvas
+
+        if keypoints[:, 2].mean() < self.min_score:
+            return None
+        points = self._points
+        points[self._index, 0] = keypoints[:, 1] * self.size / rw
+        points[self._index, 1] = keypoints[:, 0] * self.size / rh
+        points[self._index, 2] = 0.0
+        points[self._index, 3] = np.where(keypoints[:, 2] >= self.min_score, keypoints[:, 2], 0.0)
+        return points
+
+    def close(self):
+        pass
+
+
+def make_backend(name, complexity=None, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+    """Builds a backend from a name like "mediapipe", "mediapipe:0" or "movenet:models/movenet.onnx"."""
+    kind, _, arg = name.partition(":")
+    if kind == "mediapipe":
+        complexity = int(arg) if arg else 1 if complexity is None else complexity
+        return MediaPipePose(complexity, min_detection_confidence, min_tracking_confidence)
+    if kind == "movenet":
+        return MoveNet(arg, min_score=min_detection_confidence * 0.6)
+    raise ValueError(f"Unknown pose backend {name!r}")
+
+
+class BackendModel:
+    """Makes a backend look like mediapipe Pose, so the model wrappers can be reused."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def process(self, image):
+        points = self.backend.process(image)
+        return SimpleNamespace(pose_landmarks=None if points is None else array_to_landmarks(points),
+                               multi_hand_landmarks=None)
+
+    def close(self):
+        self.backend.close()
+
+
+def backend_factory(name):
+    """A load_model() factory for the named backend; it takes mediapipe-style options."""
+    def factory(model_complexity=None, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        return BackendModel(make_backend(name, model_complexity, min_detection_confidence,
+                                         min_tracking_confidence))
+    factory.__name__ = "Pose"
+    return factory
@@ -0,0 +1,13 @@
+from engine import print_event, run
+from sources import parse_args
+
+
+def main(reps=10, source=0, record=None, headless=False, on_event=None):
+    return run("bicep_curls", reps=reps, source=source, record=record,
+               headless=headless, on_event=on_event)
+
+
+if __name__ == "__main__":
+    args = parse_args(reps=10)
+    main(reps=args.reps, source=args.source, record=args.record,
+         headless=args.headless, on_event=print_event if args.headless else None)
@@ -0,0 +1,102 @@
+"""Calibration samples and the profiles kept between sessions.
+
+SampleRing holds the metric samples of one calibration step in preallocated
+arrays and summarizes them with percentiles, median and MAD.
+
+Exercises that calibrate (shoulder shrugs, neck rotation) save the
+thresholds they measured, per user and per camera, in
+~/.fitdesk/calibration.json. The next session on the same camera only checks
+the saved profile against a couple of seconds of the user's resting pose
+(the spec's "check" entry, see engine.ExerciseState) and runs the full
+calibration again only when it no longer fits.
+
+The user defaults to the login name; set FITDESK_USER to keep separate
+profiles on a shared account, and FITDESK_HOME to store them elsewhere.
+"""
+
+import getpass
+import json
+import os
+import sys
+
+import numpy as np
+
+PROFILE_DIR = os.environ.get("FITDESK_HOME", os.path.join(os.path.expanduser("~"), ".fitdesk"))
+
+
+class SampleRing:
+    """Fixed-size ring of (time, value) samples; the oldest are overwritten when full."""
+
+    def __init__(self, capacity=1024):
+        self.times = np.empty(capacity)
+        self.values = np.empty(capacity)
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, len(self.values))
+
+    def clear(self):
+        self.count = 0
+
+    def append(self, t, value):
+        i = self.count % len(self.values)
+        self.times[i] = t
+        self.values[i] = value
+        self.count += 1
+
+    def stats(self, seconds=None):
+        """low (5th percentile), median, high (95th percentile) and MAD of the samples.
+
+        With `seconds`, only the samples from that long before the newest one.
+        """
+        n = len(self)
+        values = self.values[:n]
+        if seconds is not None:
+            newest = self.times[(self.count - 1) % len(self.values)]
+            values = values[self.times[:n] >= newest - seconds]
+        low, median, high = np.percentile(values, (5, 50, 95))
+        mad = np.median(np.abs(values - median))
+        return {"low": float(low), "median": float(median), "high": float(high), "mad": float(mad)}
+
+
+def current_user():
+    return os.environ.get("FITDESK_USER") or getpass.getuser()
+
+
+def camera_id(cap):
+    """Names a camera setup: the device index and the frame size it delivers."""
+    width, height = cap.native_size
+    return f"camera{cap.index}-{width}x{height}"
+
+
+class CalibrationProfiles:
+    """Saved calibration results, read once when opened and rewritten on save()."""
+
+    def __init__(self, path=None, user=None):
+        self.path = path or os.path.join(PROFILE_DIR, "calibration.json")
+        self.user = user or current_user()
+        self._profiles = self._read()
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring calibration profiles in {self.path}: {e}", file=sys.stderr)
+            return {}
+
+    def get(self, camera, exercise):
+        """The saved profile for an exercise on a camera, or None."""
+        return self._profiles.get(self.user, {}).get(camera, {}).get(exercise)
+
+    def save(self, camera, exercise, profile):
+        self._profiles.setdefault(self.user, {}).setdefault(camera, {})[exercise] = profile
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path + ".tmp", "w") as f:
+                json.dump(self._profiles, f, indent=2)
+            os.replace(self.path + ".tmp", self.path)
+        except OSError as e:
+            print(f"Warning: Could not save calibration profile: {e}", file=sys.stderr)
@@ -0,0 +1,163 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+class ThreadedCapture:
+    """Reads a camera on a background thread and keeps only the newest frame.
+
+    Works as a drop-in for cv2.VideoCapture in the tracker loops: read() hands
+    out the most recent frame that hasn't been read yet instead of the oldest
+    one queued up in the driver, so pose inference always runs on fresh data.
+    The frame returned by read() lives in a reused buffer and is overwritten on
+    the next call.
+
+    The device is opened on the background thread too, so the constructor
+    returns at once and opening the camera overlaps with loading the models;
+    isOpened() and read() wait for it.
+    """
+
+    live = True
+
+    def __init__(self, index=0, timeout=2.0):
+        self.index = index
+        self.cap = None
+        self.timeout = timeout
+        self.opened_at = None  # perf_counter() when the device finished opening
+
+        self.frames_captured = 0
+        self.frames_read = 0
+        self.frames_dropped = 0
+        self.frame_time = None  # capture time of the frame last returned by read()
+
+        self._cond = threading.Condition()
+        self._front = None
+        self._back = None
+        self._out = None
+        self._latest_time = None
+        self._seq = 0
+        self._read_seq = 0
+        self._running = True
+        self._max_fps = None
+        self._size = None
+        self._applied_size = None
+        self.native_size = None  # (width, height) the device opened with
+        self._opened = threading.Event()
+        self._thread = threading.Thread(target=self._reader, daemon=True)
+        self._thread.start()
+
+    def _open(self):
+        cap = cv2.VideoCapture(self.index)
+        # Keep the driver-side queue as short as the backend allows.
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.native_size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        with self._cond:
+            released = not self._running
+            self.cap = cap
+            self.opened_at = time.perf_counter()
+            self._running = self._running and cap.isOpened()
+            self._cond.notify_all()
+        self._opened.set()
+        if released:
+            cap.release()
+
+    def throttle(self, fps=None, size=None):
+        """Caps the capture rate and resolution, e.g. while idle; throttle() lifts the caps.
+
+        The reader thread applies them before its next read. A frame waiting
+        in the old size when the size changes is dropped.
+        """
+        with self._cond:
+            if size != self._size:
+                self._read_seq = self._seq
+            self._max_fps = fps
+            self._size = size
+            self._cond.notify_all()
+
+    def _apply_size(self):
+        size = self._size
+        if size != self._applied_size:
+            width, height = size or self.native_size
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            self._applied_size = size
+
+    def _reader(self):
+        try:
+            self._read_frames()
+        finally:
+            # However the thread ends, readers waiting on it see the end of the stream
+            with self._cond:
+                self._running = False
+                self._cond.notify_all()
+            self._opened.set()
+
+    def _read_frames(self):
+        self._open()
+        while self._running:
+            self._apply_size()
+            ret, frame = self.cap.read(self._back)
+            stamp = time.time()
+            with self._cond:
+                if not ret:
+                    self._running = False
+                    self._cond.notify_all()
+                    break
+                if self._seq > self._read_seq:
+                    # The previous frame was never picked up by the tracker.
+                    self.frames_dropped += 1
+                self._back, self._front = self._front, frame
+                self._latest_time = stamp
+                self._seq += 1
+                self.frames_captured = self._seq
+                self._cond.notify_all()
+                if self._max_fps:
+                    # Throttled: leave frames in the driver until the next one is due
+                    self._cond.wait_for(lambda: not self._running or not self._max_fps,
+                                        1.0 / self._max_fps)
+
+    def isOpened(self):
+        self._opened.wait()
+        with self._cond:
+            return self._running or self._seq > self._read_seq
+
+    def read(self):
+        self._opened.wait()
+        with self._cond:
+            # Blocks like cv2's read() for as long as the reader is running: a slow
+            # first frame or a resolution switch must not look like the end of the stream
+            while not self._cond.wait_for(
+                    lambda: self._seq > self._read_seq or not self._running, self.timeout):
+                if not self._thread.is_alive():
+                    break
+            if self._seq == self._read_seq:
+                return False, None
+            if self._out is None or self._out.shape != self._front.shape:
+                self._out = np.empty_like(self._front)
+            np.copyto(self._out, self._front)
+            self._read_seq = self._seq
+            self.frame_time = self._latest_time
+        self.frames_read += 1
+        return True, self._out
+
+    def clock(self):
+        return time.time()
+
+    def stats(self):
+        """Counters for the frames seen so far."""
+        return {
+            "captured": self.frames_captured,
+            "read": self.frames_read,
+            "dropped": self.frames_dropped,
+        }
+
+    def release(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread.is_alive():
+            self._thread.join(timeout=self.timeout)
+        if self.cap is not None:
+            self.cap.release()
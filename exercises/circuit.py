@@ -0,0 +1,137 @@
+"""Runs a circuit of exercises back to back in one process.
+
+The camera, the pose and hands models and the speech engine are opened once
+and shared by every step, so moving to the next exercise only swaps the
+exercise logic. During rests the camera keeps running and a countdown is
+shown.
+
+    python3 exercises/circuit.py full_body
+    python3 exercises/circuit.py quick --source session.mp4 --headless
+"""
+
+import argparse
+
+import cv2
+
+from engine import FONT, Session, print_event, run
+from specs import CIRCUITS, EXERCISES
+from speech import HIGH, SilentSpeech
+
+
+def _hold_for(spec, seconds):
+    if spec.get("hold"):
+        spec = dict(spec, hold=dict(spec["hold"], seconds=seconds))
+    if spec.get("sides"):
+        spec = dict(spec, sides={side: _hold_for(side_spec, seconds)
+                                 for side, side_spec in spec["sides"].items()})
+    return spec
+
+
+def step_spec(step):
+    """The exercise spec for a circuit step, with the step's hold length applied."""
+    spec = dict(EXERCISES[step["exercise"]], name=step["exercise"])
+    if step.get("seconds"):
+        spec = _hold_for(spec, step["seconds"])
+    return spec
+
+
+def rest(session, seconds, upcoming, display=None, stop=None):
+    """Keeps the camera running for `seconds` with a countdown; False if the circuit should end."""
+    cap, prep, progress = session.cap, session.prep, session.progress
+    end = None
+    while cap.isOpened():
+        ret, raw = cap.read()
+        if not ret:
+            return False
+        now = cap.clock()
+        end = end or now + seconds
+        if now >= end:
+            return True
+        left = int(end - now) + 1
+        if progress is not None:
+            progress.update(state="rest", phase=f"rest {left}s", exercise=upcoming["name"])
+
+        key = -1
+        if display is not None:
+            frame = prep.display(raw)
+            cv2.putText(frame, f"Rest: {left}s", (50, 80), FONT, 1.5, (0, 255, 255), 3)
+            cv2.putText(frame, f"Next: {upcoming['title']}", (50, 140), FONT, 0.9, (255, 255, 255), 2)
+            key = display.show("FitDesk", frame)
+        if key == ord('q') or (stop is not None and stop.is_set()):
+            return False
+    return False
+
+
+def run_circuit(circuit, source=0, record=None, session=None, stop=None, display=None,
+                headless=False, on_event=None):
+    """Runs a circuit from specs.CIRCUITS (or a circuit dict); returns each step's rep count.
+
+    The circuit ends early when a step is stopped or the source runs out.
+    A trace holds one model's landmarks, so `record` needs a circuit whose
+    steps all use the same model.
+    """
+    circuit = CIRCUITS[circuit] if isinstance(circuit, str) else circuit
+    specs = [step_spec(step) for step in circuit["steps"]]
+    models = {spec["model"] for spec in specs}
+    if record and len(models) > 1:
+        raise ValueError(f"Can't record {circuit['title']!r} to one trace: it uses the "
+                         f"{' and '.join(sorted(models))} models")
+    own_session = session is None
+    if own_session:
+        session = Session(source, record=record, speech=SilentSpeech() if headless else None)
+        session.warm(specs)
+    speech = SilentSpeech() if headless else session.speech
+    display = None if headless else display or session.display
+
+    def emit(event, **fields):
+        if on_event is not None:
+            on_event({"event": event, "circuit": circuit["title"], **fields})
+
+    finished = []
+
+    def track(event):
+        if event["event"] == "done":
+            finished.append(event["exercise"])
+        if on_event is not None:
+            on_event(event)
+
+    emit("circuit_start", steps=len(specs))
+    speech.say(circuit["intro"], priority=HIGH)
+    counts = []
+    for i, (step, spec) in enumerate(zip(circuit["steps"], specs)):
+        emit("step", index=i, exercise=spec["name"])
+        counts.append(run(spec, reps=step.get("reps"), session=session, stop=stop, display=display,
+                          headless=headless, on_event=track))
+        if len(finished) <= i:
+            break
+        if i + 1 < len(specs) and step.get("rest"):
+            upcoming = specs[i + 1]
+            emit("rest", seconds=step["rest"], next=upcoming["name"])
+            speech.say(f"Rest for {step['rest']} seconds. Next up: {upcoming['title']}.", "rest")
+            if not rest(session, step["rest"], upcoming, display, stop):
+                break
+    else:
+        speech.say(circuit["finish"], priority=HIGH)
+
+    emit("circuit_end", completed=len(finished), steps=len(specs), counts=counts)
+    if display is not None:
+        display.close()
+    if own_session:
+        session.close()
+    speech.wait(10)
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a circuit of exercises back to back.")
+    parser.add_argument("circuit", choices=sorted(CIRCUITS))
+    parser.add_argument("--source", default="0",
+                        help="Camera index, video file or recorded landmark trace")
+    parser.add_argument("--record", metavar="PATH",
+                        help="Save the detected landmarks to a trace file")
+    parser.add_argument("--headless", action="store_true",
+                        help="No window or speech; print events as JSON lines instead")
+    args = parser.parse_args()
+
+    run_circuit(args.circuit, source=args.source, record=args.record, headless=args.headless,
+                on_event=print_event if args.headless else None)
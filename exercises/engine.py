@@ -0,0 +1,845 @@
+"""Generic rep-counting engine for the exercise definitions in specs.py.
+
+    python3 exercises/engine.py squats 12 --source session.mp4
+    python3 exercises/engine.py squats --profile --profile-json profile.json
+    python3 exercises/engine.py squats --headless --source session.mp4 > events.jsonl
+    python3 exercises/engine.py squats --cpu-budget 0.25
+"""
+
+import json
+import operator
+import os
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from backends import backend_factory
+from calibration import CalibrationProfiles, SampleRing, camera_id
+from frames import FramePrep
+from governor import COMPLEXITIES, Governor
+from idle import IdleMode
+from joints import HAND, POSE, JointTable, landmarks_to_array
+from profiler import Profiler
+from scheduler import AdaptiveInference
+from sources import RecordingModel, find_wrapper, load_model, open_source, parse_args, reset_model
+from specs import EXERCISES
+from speech import HIGH, LOW, NORMAL, SilentSpeech, shared_speech
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+DERIVED = {
+    "mean": lambda values: sum(values) / len(values),
+    "min": min,
+    "max": max,
+    "diff": lambda values: values[0] - values[1],
+    "absdiff": lambda values: abs(values[0] - values[1]),
+}
+
+# Calibration reduce -> (SampleRing statistic, trailing seconds or None for the whole step)
+REDUCERS = {
+    "last": ("median", 1.0),
+    "min": ("low", None),
+    "max": ("high", None),
+    "median": ("median", None),
+}
+
+
+class MetricSet:
+    """Evaluates the metrics of one or more exercises from a single landmark array.
+
+    Angles, distances and coordinates used by any of the specs are gathered
+    into one JointTable and one coordinate index, so they come out of a few
+    numpy calls per frame however many exercises are being tracked; derived
+    metrics are then combined per spec.
+    """
+
+    def __init__(self, specs, index=POSE):
+        angles, distances, coords = {}, {}, {}
+        self._plans = []
+        for spec in specs:
+            plan = []
+            for name, (kind, *args) in spec["metrics"].items():
+                key = tuple(args)
+                if kind == "angle":
+                    plan.append((name, "angle", angles.setdefault(key, len(angles))))
+                elif kind == "distance":
+                    plan.append((name, "distance", distances.setdefault(key, len(distances))))
+                elif kind in ("x", "y", "nx", "ny"):
+                    plan.append((name, "coord", coords.setdefault((kind, args[0]), len(coords))))
+                elif kind in DERIVED:
+                    plan.append((name, kind, args))
+                else:
+                    raise ValueError(f"Unknown metric kind {kind!r} for {name!r}")
+            self._plans.append(plan)
+
+        self.table = JointTable(angles={k: k for k in angles}, distances={k: k for k in distances},
+                                index=index)
+        self._coord_index = np.array([index[name] for _, name in coords], dtype=np.intp)
+        self._coord_axis = np.array([0 if kind in ("x", "nx") else 1 for kind, _ in coords],
+                                    dtype=np.intp)
+        self._coord_pixels = np.array([not kind.startswith("n") for kind, _ in coords])
+
+    def evaluate(self, points, size):
+        """Metric values for each spec, as a list of name -> float dicts."""
+        angles = self.table.angles(points, size).tolist()
+        distances = self.table.distances(points, size).tolist()
+        scale = np.where(self._coord_pixels, np.take(size, self._coord_axis), 1.0)
+        coords = (points[self._coord_index, self._coord_axis] * scale).tolist()
+
+        results = []
+        for plan in self._plans:
+            values = {}
+            for name, kind, ref in plan:
+                if kind == "angle":
+                    values[name] = angles[ref]
+                elif kind == "distance":
+                    values[name] = distances[ref]
+                elif kind == "coord":
+                    values[name] = coords[ref]
+                else:
+                    values[name] = DERIVED[kind]([values[m] for m in ref])
+            results.append(values)
+        return results
+
+
+class ExerciseState:
+    """Calibration, rep and hold state for one exercise.
+
+    update() is fed the metric values for each frame (None when nobody is
+    detected) together with the frame time, and returns what should be said
+    as (text, key, priority) tuples for Speech.say().
+
+    With a saved `profile` (see calibration.py) and a "check" entry in the
+    spec, the first calibration step's metric is only sampled for a couple of
+    seconds: if it is within the check's tolerance of the saved resting value
+    the saved thresholds are used, shifted by the difference, and otherwise
+    the full calibration runs. After a full calibration `new_profile` holds
+    what should be saved.
+    """
+
+    def __init__(self, spec, target=None, profile=None):
+        self.spec = spec
+        self.hold = spec.get("hold")
+        self.target = target if target is not None else spec.get("reps")
+        self.count = 0
+        self.done = False
+        self.params = {}
+        self.phase = spec.get("start")
+        self.phase_since = None
+        self.last_rep_time = None
+
+        self.steps = spec.get("calibration", [])
+        self.step = 0
+        self.step_start = None
+        self.samples = SampleRing()
+        self.profile = profile if spec.get("check") and self.steps else None
+        self.checking = self.profile is not None
+        self.reference = None
+        self.new_profile = None
+
+        self.hold_start = None
+        self.holding = False
+        self.elapsed = 0.0
+        self.cues_said = set()
+
+    @property
+    def calibrating(self):
+        return self.checking or self.step < len(self.steps)
+
+    @property
+    def status(self):
+        """Instruction text for the current calibration step, if any."""
+        if self.checking and self.step_start is not None:
+            return self.spec["check"].get("text")
+        if self.calibrating and self.step_start is not None:
+            return self.steps[self.step].get("text")
+        return None
+
+    def value(self, name, values):
+        return self.params[name] if name in self.params else values[name]
+
+    def check(self, predicate, values):
+        metric, op, threshold, *offset = predicate
+        if isinstance(threshold, str):
+            threshold = self.params[threshold]
+        return OPERATORS[op](values[metric], threshold + sum(offset))
+
+    def update(self, values, now):
+        said = []
+        if self.done:
+            return said
+        if self.calibrating:
+            if values is not None:
+                (self._check if self.checking else self._calibrate)(values, now, said)
+            return said
+        if self.hold:
+            self._update_hold(values, now, said)
+        elif values is not None:
+            self._update_reps(values, now, said)
+        return said
+
+    def _check(self, values, now, said):
+        check, metric = self.spec["check"], self.steps[0]["metric"]
+        if self.step_start is None:
+            self.step_start = now
+            if check.get("say"):
+                said.append((check["say"], "step", NORMAL))
+        self.samples.append(now, values[metric])
+        if now - self.step_start <= check.get("seconds", 2):
+            return
+
+        shift = self.samples.stats()["median"] - self.profile["reference"]
+        self.checking = False
+        self.step_start = None
+        self.samples.clear()
+        if abs(shift) > check.get("tolerance", 15):
+            if check.get("drifted"):
+                said.append((check["drifted"], "step", NORMAL))
+            return
+        self.params = dict(self.profile["params"])
+        for step in self.steps:
+            if step.get("param") and step["metric"] == metric:
+                self.params[step["param"]] += shift
+        self.step = len(self.steps)
+        if self.spec.get("calibrated"):
+            said.append((self.spec["calibrated"], "step", NORMAL))
+
+    def _calibrate(self, values, now, said):
+        step = self.steps[self.step]
+        if self.step_start is None:
+            self.step_start = now
+            if step.get("say"):
+                said.append((step["say"], "step", NORMAL))
+        self.samples.append(now, values[step["metric"]])
+
+        if now - self.step_start > step["seconds"] or self._settled(step, now):
+            if self.step == 0:
+                self.reference = self.samples.stats()["median"]
+            if step.get("param"):
+                statistic, seconds = REDUCERS[step.get("reduce", "last")]
+                self.params[step["param"]] = self.samples.stats(seconds)[statistic] + step.get("offset", 0)
+            self.step += 1
+            self.step_start = None
+            self.samples.clear()
+            if not self.calibrating:
+                self.phase = step.get("phase", self.phase)
+                self.new_profile = {"params": dict(self.params), "reference": self.reference}
+                if self.spec.get("calibrated"):
+                    said.append((self.spec["calibrated"], "step", NORMAL))
+
+    def _settled(self, step, now):
+        """True once the last `settle` seconds of a step are steady, and away from rest if required."""
+        settle = step.get("settle")
+        if not settle or now - self.step_start < settle:
+            return False
+        stats = self.samples.stats(settle)
+        if stats["high"] - stats["low"] > step.get("steady", 6.0):
+            return False
+        away = step.get("away")
+        if not away or self.reference is None:
+            return True
+        moved = stats["median"] - self.reference
+        reduce = step.get("reduce", "last")
+        return moved <= -away if reduce == "min" else moved >= away if reduce == "max" else abs(moved) >= away
+
+    def _update_reps(self, values, now, said):
+        if self.phase_since is None:
+            self.phase_since = now
+        for transition in self.spec["transitions"]:
+            sources = transition["from"]
+            if self.phase not in ((sources,) if isinstance(sources, str) else sources):
+                continue
+            if now - self.phase_since < transition.get("min_time", 0):
+                continue
+            cooldown = transition.get("cooldown")
+            if cooldown and self.last_rep_time is not None and now - self.last_rep_time <= cooldown:
+                continue
+            if not all(self.check(p, values) for p in transition.get("when", ())):
+                continue
+
+            self.phase = transition["to"]
+            self.phase_since = now
+            if transition.get("count"):
+                self.count += 1
+                self.last_rep_time = now
+                said.append((self.spec.get("rep_say", "Repetition {count}").format(count=self.count),
+                             "count", NORMAL))
+            break
+
+        if self.target and self.count >= self.target:
+            self.done = True
+            said.append((self.spec["finish"], None, NORMAL))
+
+    def _update_hold(self, values, now, said):
+        hold = self.hold
+        self.holding = values is not None and all(self.check(p, values) for p in hold["when"])
+        if self.holding:
+            if self.hold_start is None:
+                self.hold_start = now
+                if hold.get("start_say"):
+                    said.append((hold["start_say"], "hold", NORMAL))
+            self.elapsed = now - self.hold_start
+            for at, text in hold.get("cues", ()):
+                if self.elapsed >= at and at not in self.cues_said:
+                    self.cues_said.add(at)
+                    said.append((text, "cue", LOW))
+            if self.elapsed >= hold["seconds"]:
+                self.done = True
+                said.append((self.spec["finish"], None, NORMAL))
+        elif values is not None and self.hold_start is not None and hold.get("reset_on_loss"):
+            self.hold_start = None
+            self.elapsed = 0.0
+            self.cues_said.clear()
+            if hold.get("lost_say"):
+                said.append((hold["lost_say"], "hold", NORMAL))
+
+    @property
+    def remaining(self):
+        return max(0, self.hold["seconds"] - int(self.elapsed))
+
+    @property
+    def phase_label(self):
+        if self.calibrating:
+            return "calibrating"
+        if self.hold:
+            return "holding" if self.holding else "waiting"
+        return self.phase or ""
+
+
+class BilateralState:
+    """An ExerciseState per side of a "sides" spec, all fed from the same frame.
+
+    update() takes the metric values of each side, in the order of
+    spec["sides"], and the sides count and hold independently; `count` and
+    `target` are the totals over both sides and `counts` holds each side's.
+    """
+
+    def __init__(self, spec, target=None):
+        self.spec = spec
+        self.sides = {side: ExerciseState(side_spec, target) for side, side_spec in spec["sides"].items()}
+        self.hold = None
+        self.done = False
+        self.new_profile = None
+
+    @property
+    def count(self):
+        return sum(state.count for state in self.sides.values())
+
+    @property
+    def counts(self):
+        return {side: state.count for side, state in self.sides.items()}
+
+    @property
+    def target(self):
+        targets = [state.target for state in self.sides.values()]
+        return None if None in targets else sum(targets)
+
+    @property
+    def calibrating(self):
+        return any(state.calibrating for state in self.sides.values())
+
+    @property
+    def status(self):
+        return next((state.status for state in self.sides.values() if state.status), None)
+
+    @property
+    def params(self):
+        return {f"{side}.{name}": value for side, state in self.sides.items()
+                for name, value in state.params.items()}
+
+    def update(self, values, now):
+        said = []
+        if self.done:
+            return said
+        for i, (side, state) in enumerate(self.sides.items()):
+            for text, key, priority in state.update(None if values is None else values[i], now):
+                # Keyed per side, so one side's rep call doesn't replace the other's
+                said.append((text, key and f"{side}-{key}", priority))
+        if all(state.done for state in self.sides.values()):
+            self.done = True
+            said.append((self.spec["finish"], None, NORMAL))
+        return said
+
+    @property
+    def phase_label(self):
+        return " ".join(f"{side[0].upper()}:{'done' if state.done else state.phase_label}"
+                        for side, state in self.sides.items())
+
+
+def _landmarks(results, model):
+    if model == "hands":
+        return results.multi_hand_landmarks[0] if results.multi_hand_landmarks else None
+    return results.pose_landmarks
+
+
+def _mediapipe():
+    # Imported on first use: it takes over a second, so Session starts it on a thread
+    import mediapipe
+    return mediapipe
+
+
+def load_exercise_model(cap, spec, complexity=1, backend="mediapipe"):
+    """The pose or hands model an exercise needs, behind the shared frame pipeline.
+
+    `complexity` is mediapipe's model_complexity: 0 is faster, 1 is its default.
+    `backend` picks the pose model (see backends.py); hands always use mediapipe.
+    A hands spec with "seed": "pose" finds the hand from the pose model's wrist
+    (see roi.PoseSeededHands) instead of running palm detection on full frames.
+    """
+    mp = _mediapipe()
+    confidence = spec.get("confidence", 0.5)
+    pose = mp.solutions.pose.Pose if backend == "mediapipe" else backend_factory(backend)
+    if spec["model"] == "hands":
+        seed = None
+        if spec.get("seed") == "pose":
+            def seed():
+                return pose(model_complexity=complexity, min_detection_confidence=confidence,
+                            min_tracking_confidence=confidence)
+        return load_model(cap, mp.solutions.hands.Hands, mirror=True, seed=seed,
+                          static_image_mode=False, max_num_hands=1, model_complexity=complexity,
+                          min_detection_confidence=confidence, min_tracking_confidence=confidence)
+    return load_model(cap, pose, adaptive=True, roi=True, mirror=True,
+                      model_complexity=complexity,
+                      min_detection_confidence=confidence, min_tracking_confidence=confidence)
+
+
+def _takes_rgb(spec):
+    """Whether the spec's model is fed RGB frames; the cropping wrappers take BGR."""
+    return spec["model"] == "hands" and spec.get("seed") is None
+
+
+def draw_overlay(frame, spec, state, values, landmarks):
+    h, w = frame.shape[:2]
+    mp = _mediapipe()
+    mp_drawing = mp.solutions.drawing_utils
+
+    if landmarks is not None:
+        connections = (mp.solutions.hands.HAND_CONNECTIONS if spec["model"] == "hands"
+                       else mp.solutions.pose.POSE_CONNECTIONS)
+        mp_drawing.draw_landmarks(frame, landmarks, connections,
+                                  mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=3),
+                                  mp_drawing.DrawingSpec(color=(255, 0, 0), thickness=2, circle_radius=2))
+        index = HAND if spec["model"] == "hands" else POSE
+        for name in spec.get("highlight", ()):
+            lm = landmarks.landmark[index[name]]
+            cv2.circle(frame, (int(lm.x * w), int(lm.y * h)), 8, (255, 0, 255), -1)
+
+    if spec.get("sides"):
+        _draw_sides(frame, spec, state, values)
+        return
+
+    if values is None:
+        if spec.get("missing"):
+            cv2.putText(frame, spec["missing"], (50, 50), FONT, 0.7, (0, 0, 255), 2)
+    elif state.status:
+        cv2.putText(frame, state.status, (50, 50), FONT, 0.7, (0, 255, 255), 2)
+    else:
+        for i, (label, metric) in enumerate(spec.get("show", {}).items()):
+            cv2.putText(frame, f"{label}: {int(values[metric])}", (30, 50 + 40 * i),
+                        FONT, 0.8, (0, 255, 255), 2)
+
+    if values is not None and not state.calibrating:
+        for kind, *names in spec.get("guides", ()):
+            at = int(sum(state.value(name, values) for name in names))
+            if kind == "hline":
+                cv2.line(frame, (50, at), (w - 50, at), (0, 255, 0), 2)
+            else:
+                cv2.line(frame, (at, 0), (at, h), (0, 255, 0), 2)
+
+    if state.hold:
+        if state.holding:
+            cv2.putText(frame, f"Time left: {state.remaining}s", (30, 130), FONT, 0.9, (0, 255, 0), 2)
+    else:
+        cv2.putText(frame, f"{spec.get('counter', 'Reps')}: {state.count}/{state.target}",
+                    (50, h - 50), FONT, 1, (0, 255, 0), 2)
+
+
+def _draw_sides(frame, spec, state, values):
+    """Each side's metrics and count or hold timer, in its own column."""
+    h, w = frame.shape[:2]
+    for i, (side, side_state) in enumerate(state.sides.items()):
+        x = 30 + i * (w // 2)
+        side_spec = spec["sides"][side]
+        if values is not None and not side_state.calibrating:
+            for j, (label, metric) in enumerate(side_spec.get("show", {}).items()):
+                cv2.putText(frame, f"{label}: {int(values[i][metric])}", (x, 50 + 40 * j),
+                            FONT, 0.7, (0, 255, 255), 2)
+        if side_state.hold:
+            text = (f"{side.title()}: done" if side_state.done else
+                    f"{side.title()}: {side_state.remaining}s left" if side_state.holding else
+                    f"{side.title()}: waiting")
+        else:
+            text = f"{side.title()}: {side_state.count}/{side_state.target}"
+        cv2.putText(frame, text, (x, h - 50), FONT, 0.9, (0, 255, 0), 2)
+
+
+class WindowDisplay:
+    """Shows frames in a native OpenCV window; show() returns the key pressed."""
+
+    def show(self, title, frame):
+        cv2.imshow(title, frame)
+        return cv2.waitKey(1) & 0xFF
+
+    def close(self):
+        cv2.destroyAllWindows()
+
+
+class StreamDisplay:
+    """Hands frames to a stream.FrameStreamer for the web page instead of a window."""
+
+    def __init__(self, streamer):
+        self.streamer = streamer
+
+    def show(self, title, frame):
+        self.streamer.push(frame)
+        return -1
+
+    def close(self):
+        pass
+
+
+class Session:
+    """Camera, models and speech kept open across exercise runs.
+
+    run() opens a throwaway session per call; a long-lived process (see
+    worker.py) keeps one so later exercises start on a warm camera and
+    already-loaded models.
+
+    Opening the camera, importing mediapipe and starting the speech engine
+    each happen on their own thread, so they overlap with each other and
+    with building the models; startup_report() says when each was done.
+    """
+
+    def __init__(self, source=0, record=None, speech=None):
+        self.started = time.perf_counter()
+        self.startup = {}
+        self.cap = open_source(source, record=record)
+        threading.Thread(target=self._import_mediapipe, name="mediapipe-import", daemon=True).start()
+        self.speech = speech or shared_speech()
+        self.prep = FramePrep()
+        self.display = WindowDisplay()
+        self.progress = None
+        self.profiler = Profiler(enabled=False)
+        # Saved calibrations only make sense for a live camera, not a replay
+        self.profiles = CalibrationProfiles() if self.cap.live else None
+        self.backend = os.environ.get("FITDESK_POSE_BACKEND", "mediapipe")
+        self._models = {}
+
+    def _import_mediapipe(self):
+        _mediapipe()
+        self.mark("mediapipe")
+
+    def mark(self, milestone):
+        """Records the first time a startup milestone is reached."""
+        self.startup.setdefault(milestone, time.perf_counter() - self.started)
+
+    def startup_report(self):
+        """Seconds from opening the session to each startup milestone, in order."""
+        report = dict(self.startup)
+        for milestone, at in (("camera", getattr(self.cap, "opened_at", None)),
+                              ("speech", getattr(self.speech, "ready_at", None))):
+            if at is not None:
+                report[milestone] = max(0.0, at - self.started)
+        return dict(sorted(report.items(), key=lambda item: item[1]))
+
+    def model(self, spec, complexity=1):
+        key = (spec["model"], spec.get("confidence", 0.5), complexity, self.backend)
+        if key not in self._models:
+            self._models[key] = load_exercise_model(self.cap, spec, complexity, self.backend)
+        return self._models[key]
+
+    def warm(self, specs, complexities=(1,)):
+        """Loads every model the specs need, at each complexity, and runs each once on a live frame."""
+        if not complexities:
+            return
+        # Built before touching the camera, which may still be opening
+        models = [(spec, self.model(spec, c)) for spec in specs for c in complexities]
+        self.mark("models")
+        if not self.cap.live or not self.cap.isOpened():
+            return
+        ret, frame = self.cap.read()
+        if ret:
+            frame = frame.copy()
+            for spec, model in models:
+                # The warm-up frame isn't part of the recorded session
+                if isinstance(model, RecordingModel):
+                    model = model.model
+                model.process(self.prep.rgb(frame) if _takes_rgb(spec) else frame)
+        self.mark("warm")
+
+    def wait_for_camera(self, seconds):
+        """Waits, at most `seconds` after the session opened, for the camera's exposure to settle.
+
+        Auto exposure makes the first frames of a webcam dark or flickering;
+        the camera counts as ready once a few frames in a row keep the same
+        brightness.
+        """
+        if self.cap.live and seconds:
+            deadline = self.started + seconds
+            last, steady = None, 0
+            while steady < 3 and time.perf_counter() < deadline:
+                ret, frame = self.cap.read()
+                if not ret:
+                    break
+                level = float(frame[::16, ::16].mean())
+                steady = steady + 1 if last is not None and level > 10 and abs(level - last) < 1 else 0
+                last = level
+        self.mark("ready")
+
+    def close(self):
+        self.cap.release()
+        for model in self._models.values():
+            model.close()
+        self._models.clear()
+
+
+def run(exercise, reps=None, source=0, record=None, session=None, stop=None, display=None,
+        profiler=None, headless=False, on_event=None, governor=None):
+    """Runs one exercise from specs.EXERCISES (or a spec dict) and returns the rep count.
+
+    Pass a Session to reuse its camera and models, and a threading.Event as
+    `stop` to end the exercise from another thread. Frames go to `display`
+    (the session's window by default) and progress to the session's
+    ProgressWriter, if it has one. A Profiler times each stage of the loop.
+
+    `headless` skips mirroring, drawing, the window and speech. Diagnostics go
+    to stderr, so stdout stays free for the print_event stream. `on_event`
+    is called with a dict for each start, ready, say, phase, calibrated, rep,
+    idle, active, done, stopped, end and error event, headless or not;
+    "ready" carries the session's startup_report().
+
+    On a live camera, a few seconds without anyone in frame put the tracker
+    in a low-power idle state until someone is detected again (see
+    idle.IdleMode), and a governor.Governor (by default one for the
+    FITDESK_*_BUDGET variables, if set) trades frame rate and model cost to
+    stay within its budget, with a "governor" event for each change.
+
+    A spec with "sides" tracks both sides from the same inference (see
+    BilateralState); the count returned is the total, and rep, stopped, done
+    and end events carry each side's count as "sides".
+    """
+    spec = EXERCISES[exercise] if isinstance(exercise, str) else exercise
+    own_session = session is None
+    if own_session:
+        session = Session(source, record=record, speech=SilentSpeech() if headless else None)
+    cap, speech, prep, progress = session.cap, session.speech, session.prep, session.progress
+    name = exercise if isinstance(exercise, str) else spec.get("name", spec["title"])
+    display = None if headless else display or session.display
+    profiler = profiler or session.profiler
+    if headless:
+        speech = SilentSpeech()
+
+    def emit(event, **fields):
+        if on_event is not None:
+            on_event({"event": event, "exercise": name, **fields})
+
+    def finish(count, frames, **fields):
+        # Every run ends here, whether it opened the camera or not
+        emit("end", count=count, frames=frames, time=cap.clock(), **fields)
+        if own_session:
+            session.close()
+        if display is not None:
+            display.close()
+        speech.wait(10)
+        return count
+
+    # Replays keep every frame and full model cost so they stay deterministic
+    governor = (governor or Governor.from_env()) if cap.live else None
+    # Built while the camera may still be opening
+    model = session.model(spec, governor.settings["complexity"] if governor else 1)
+    models = {}
+    if governor is not None:
+        # Every complexity the governor may switch to, so a switch never stalls the loop
+        for complexity in COMPLEXITIES:
+            try:
+                models[complexity] = session.model(spec, complexity)
+            except Exception as e:
+                # mediapipe downloads the lite pose model on first use; the governor keeps the current one
+                print(f"Governor: Could not load model complexity {complexity}: {e}", file=sys.stderr)
+    session.mark("models")
+    if not cap.isOpened():
+        print("Error: Could not open webcam.", file=sys.stderr)
+        emit("error", message="Could not open webcam.")
+        if progress is not None:
+            progress.update(state="error", exercise=name, error="Could not open webcam.")
+        speech.say("Camera failed to open. Please check and restart.", priority=HIGH)
+        return finish(0, 0)
+    session.wait_for_camera(spec.get("warmup"))
+    session.warm([spec], [c for c in models if models[c] is not model])
+    sides = spec.get("sides")
+    metrics = MetricSet(list(sides.values()) if sides else [spec], HAND if spec["model"] == "hands" else POSE)
+    profiles = session.profiles if spec.get("check") else None
+    camera = camera_id(cap) if profiles else None
+    if sides:
+        state = BilateralState(spec, reps)
+    else:
+        state = ExerciseState(spec, reps, profiles.get(camera, name) if profiles else None)
+
+    def totals():
+        # Bilateral exercises also report each side's count
+        return {"sides": state.counts} if sides else {}
+
+    idle = IdleMode(cap) if cap.live else None
+    if governor is not None:
+        governor.apply(cap, model)
+    points = None
+    frames = 0
+    fps, last_frame = 0.0, None
+    if progress is not None:
+        progress.update(state="running", exercise=name, reps=0, target=state.target,
+                        phase=state.phase_label, fps=0.0, error="")
+
+    emit("start", target=state.target, time=cap.clock())
+    emit("say", text=spec["intro"], time=cap.clock())
+    speech.say(spec["intro"], priority=HIGH)
+
+    while cap.isOpened():
+        with profiler.span("read"):
+            ret, raw = cap.read()
+        if not ret:
+            break
+        now = cap.clock()
+        busy_since = time.perf_counter()
+        frames += 1
+        if frames == 1:
+            session.mark("first_frame")
+            profiler.startup = session.startup_report()
+            emit("ready", startup=profiler.startup, time=now, frame=frames)
+
+        # Idle frames only reach the model when the cheap probe asks for it, and
+        # give no metrics: they are throttled to a lower resolution
+        active = idle is None or idle.active(raw)
+        with profiler.span("model"):
+            results = None
+            probing = not active and idle.idle and idle.probe(raw, now)
+            adaptive = find_wrapper(model, AdaptiveInference) if probing else None
+            if adaptive is not None:
+                # A still, empty scene would otherwise just get the cached "nobody" back
+                adaptive.infer_next()
+            if active or probing:
+                results = model.process(prep.rgb(raw) if _takes_rgb(spec) else raw)
+        h, w = raw.shape[:2]
+
+        with profiler.span("metrics"):
+            landmarks = _landmarks(results, spec["model"]) if results is not None else None
+            values = None
+            if landmarks is not None and active:
+                points = landmarks_to_array(landmarks, points)
+                values = metrics.evaluate(points, (w, h))
+                if not sides:
+                    values = values[0]
+        if idle is not None:
+            change = idle.update(landmarks is not None, now)
+            if change:
+                emit(change, time=now, frame=frames)
+                if change == "active":
+                    # Crops and cached results from the throttled idle frames don't carry over
+                    reset_model(model)
+                    if governor is not None:
+                        governor.apply(cap, model)
+
+        with profiler.span("logic"):
+            count, phase, calibrating = state.count, state.phase_label, state.calibrating
+            said = state.update(values, now)
+        if calibrating and not state.calibrating and profiles is not None and state.new_profile:
+            profiles.save(camera, name, state.new_profile)
+        if on_event is not None:
+            if calibrating and not state.calibrating:
+                emit("calibrated", params=dict(state.params), time=now, frame=frames)
+            if state.phase_label != phase:
+                emit("phase", phase=state.phase_label, time=now, frame=frames)
+            if state.count != count:
+                emit("rep", count=state.count, time=now, frame=frames, **totals())
+            for text, _, _ in said:
+                emit("say", text=text, time=now, frame=frames)
+        with profiler.span("speech"):
+            for text, key, priority in said:
+                speech.say(text, key, priority)
+
+        key = -1
+        if display is not None:
+            with profiler.span("mirror"):
+                frame = prep.display(raw)
+            with profiler.span("draw"):
+                if idle is not None and idle.idle:
+                    cv2.putText(frame, "Paused - step into view to continue", (30, 40),
+                                FONT, 0.7, (0, 255, 255), 2)
+                else:
+                    draw_overlay(frame, spec, state, values, landmarks)
+                if profiler.hud:
+                    profiler.draw_hud(frame)
+            with profiler.span("show"):
+                key = display.show(spec["title"], frame)
+
+        if progress is not None:
+            tick = time.perf_counter()
+            if last_frame is not None:
+                rate = 1.0 / max(tick - last_frame, 1e-6)
+                fps = rate if fps == 0.0 else 0.9 * fps + 0.1 * rate
+            last_frame = tick
+            progress.update(reps=state.count, fps=fps,
+                            phase="idle" if idle is not None and idle.idle else state.phase_label)
+        profiler.frame_done()
+
+        if governor is not None and not (idle is not None and idle.idle):
+            governor.frame(time.perf_counter() - busy_since)
+            decision = governor.update()
+            if decision is not None:
+                emit("governor", time=now, frame=frames, **decision)
+                swapped = models.get(governor.settings["complexity"], model)
+                if swapped is not model:
+                    # Its crop and cached results are from whenever it last ran
+                    model = swapped
+                    reset_model(model)
+                governor.apply(cap, model)
+
+        if state.done:
+            break
+
+        if key == ord('q') or (stop is not None and stop.is_set()):
+            emit("stopped", count=state.count, time=now, frame=frames, **totals())
+            if spec.get("stop"):
+                emit("say", text=spec["stop"], time=now, frame=frames)
+                speech.say(spec["stop"], priority=HIGH)
+            break
+
+    if idle is not None:
+        idle.close()
+    if governor is not None:
+        cap.throttle()
+    if state.done:
+        emit("done", count=state.count, time=cap.clock(), frame=frames, **totals())
+    if progress is not None:
+        progress.update(state="done" if state.done else "stopped", reps=state.count, fps=0.0)
+    return finish(state.count, frames, **totals())
+
+
+def format_startup(report):
+    return "Startup: " + ", ".join(f"{milestone} {seconds:.2f}s" for milestone, seconds in report.items())
+
+
+def print_event(event):
+    """on_event callback writing each event as one JSON line on stdout."""
+    print(json.dumps(event), flush=True)
+
+
+if __name__ == "__main__":
+    args = parse_args(reps=0, exercises=EXERCISES, profile=True, budget=True)
+    profiler = Profiler(enabled=args.profile or bool(args.profile_json), hud=args.profile)
+    governor = None
+    if args.cpu_budget or args.latency_budget:
+        governor = Governor(cpu=args.cpu_budget, latency=args.latency_budget)
+    try:
+        run(args.exercise, reps=args.reps or None, source=args.source, record=args.record,
+            profiler=profiler, headless=args.headless, on_event=print_event if args.headless else None,
+            governor=governor)
+    finally:
+        if profiler.enabled and profiler.startup:
+            print(format_startup(profiler.startup), file=sys.stderr)
+        if args.profile_json:
+            profiler.dump(args.profile_json)
@@ -0,0 +1,73 @@
+import cv2
+import numpy as np
+
+# Pose landmark pairs that trade places when the image is mirrored
+# (eyes, ears, mouth corners, shoulders, elbows, wrists, hands, hips, knees, feet).
+POSE_MIRROR_PAIRS = (
+    (1, 4), (2, 5), (3, 6), (7, 8), (9, 10), (11, 12), (13, 14), (15, 16),
+    (17, 18), (19, 20), (21, 22), (23, 24), (25, 26), (27, 28), (29, 30), (31, 32),
+)
+
+
+class FramePrep:
+    """Mirrors and colour-converts camera frames into reused buffers.
+
+    The trackers show a mirrored view, but the models don't need one: they can
+    run on the raw camera frame and have their landmarks mirrored instead (see
+    MirroredModel), so only the display path pays for the flip.
+    """
+
+    def __init__(self):
+        self._display = None
+        self._rgb = None
+
+    def display(self, frame):
+        """Mirrored copy of `frame` for drawing and imshow."""
+        if self._display is None or self._display.shape != frame.shape:
+            self._display = np.empty_like(frame)
+        return cv2.flip(frame, 1, dst=self._display)
+
+    def rgb(self, frame):
+        """RGB copy of a BGR `frame` for models that take the whole frame."""
+        if self._rgb is None or self._rgb.shape != frame.shape:
+            self._rgb = np.empty_like(frame)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+
+
+class MirroredModel:
+    """Runs a model on unmirrored frames and returns landmarks as if the input were mirrored.
+
+    x becomes 1 - x, and left/right pose landmarks and hand labels are swapped,
+    which matches what the model reports on a flipped image.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._spare = None
+
+    def process(self, image):
+        results = self.model.process(image)
+
+        pose_landmarks = getattr(results, "pose_landmarks", None)
+        if pose_landmarks is not None:
+            landmarks = pose_landmarks.landmark
+            if self._spare is None:
+                self._spare = type(landmarks[0])()
+            for a, b in POSE_MIRROR_PAIRS:
+                self._spare.CopyFrom(landmarks[a])
+                landmarks[a].CopyFrom(landmarks[b])
+                landmarks[b].CopyFrom(self._spare)
+            for lm in landmarks:
+                lm.x = 1.0 - lm.x
+
+        for hand_landmarks in getattr(results, "multi_hand_landmarks", None) or []:
+            for lm in hand_landmarks.landmark:
+                lm.x = 1.0 - lm.x
+        for handedness in getattr(results, "multi_handedness", None) or []:
+            for classification in handedness.classification:
+                classification.label = "Right" if classification.label == "Left" else "Left"
+
+        return results
+
+    def close(self):
+        self.model.close()
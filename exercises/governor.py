@@ -0,0 +1,149 @@
+"""Keeps a live tracker within a CPU or latency budget.
+
+The governor steps through LEVELS, from the best tracking quality to the
+cheapest, adjusting the camera frame rate, the size full frames are shrunk
+to before inference (roi.RegionOfInterest.full_size), the share of its
+default size the crop around a tracked person is resized to
+(roi.RegionOfInterest.input_size), the minimum inference stride
+(scheduler.AdaptiveInference.min_stride) and the model complexity. Capture
+resolution is left alone since metrics are measured in pixels.
+
+Every `interval` seconds it compares the measured load with the budget. It
+only steps down after `patience` windows over budget and only steps back up
+after `patience_up` windows below `headroom` of it, so it settles instead of
+oscillating. Every decision is printed and kept in `decisions`.
+
+Budgets come from the engine's --cpu-budget/--latency-budget or from
+FITDESK_CPU_BUDGET (share of the whole machine, 0-1) and
+FITDESK_LATENCY_BUDGET (milliseconds of processing per frame).
+"""
+
+import os
+import sys
+import time
+
+from roi import RegionOfInterest
+from scheduler import AdaptiveInference
+from sources import find_wrapper
+
+LEVELS = (
+    {"fps": None, "input": 640, "crop": 1.0, "stride": 1, "complexity": 1},
+    {"fps": None, "input": 480, "crop": 0.875, "stride": 1, "complexity": 1},
+    {"fps": 24, "input": 480, "crop": 0.875, "stride": 2, "complexity": 1},
+    {"fps": 20, "input": 480, "crop": 0.75, "stride": 2, "complexity": 0},
+    {"fps": 15, "input": 320, "crop": 0.625, "stride": 2, "complexity": 0},
+    {"fps": 10, "input": 320, "crop": 0.625, "stride": 3, "complexity": 0},
+)
+# Every model complexity a level can ask for, so they can all be loaded up front
+COMPLEXITIES = tuple(sorted({level["complexity"] for level in LEVELS}))
+
+
+class Governor:
+    def __init__(self, cpu=None, latency=None, interval=2.0, patience=2, patience_up=5,
+                 headroom=0.6, level=0):
+        if cpu is None and latency is None:
+            raise ValueError("Governor needs a CPU or a latency budget")
+        self.cpu = cpu
+        self.latency = latency
+        self.interval = interval
+        self.patience = patience
+        self.patience_up = patience_up
+        self.headroom = headroom
+        self.level = level
+        self.decisions = []
+
+        self._over = 0
+        self._under = 0
+        self._reset(time.perf_counter())
+
+    @classmethod
+    def from_env(cls):
+        """A governor for the FITDESK_*_BUDGET variables, or None when neither is set."""
+        cpu = os.environ.get("FITDESK_CPU_BUDGET")
+        latency = os.environ.get("FITDESK_LATENCY_BUDGET")
+        if not cpu and not latency:
+            return None
+        return cls(cpu=float(cpu) if cpu else None, latency=float(latency) if latency else None)
+
+    @property
+    def settings(self):
+        return LEVELS[self.level]
+
+    def _reset(self, now):
+        self._start = now
+        self._cpu_start = time.process_time()
+        self._busy = 0.0
+        self._frames = 0
+
+    def frame(self, seconds):
+        """Records how long one frame took to process, camera wait excluded."""
+        self._busy += seconds
+        self._frames += 1
+
+    def load(self, now):
+        """(measure, value, budget) for each budget, over the current window."""
+        measured = []
+        if self.cpu is not None:
+            share = (time.process_time() - self._cpu_start) / max(now - self._start, 1e-6) / (os.cpu_count() or 1)
+            measured.append(("cpu", share, self.cpu))
+        if self.latency is not None and self._frames:
+            measured.append(("latency", self._busy / self._frames * 1e3, self.latency))
+        return measured
+
+    def update(self, now=None):
+        """Re-evaluates at the end of each window; returns the decision when the level changes."""
+        now = time.perf_counter() if now is None else now
+        if now - self._start < self.interval:
+            return None
+        measured = self.load(now)
+        self._reset(now)
+        if not measured:
+            return None
+        # The tightest budget decides
+        name, value, budget = max(measured, key=lambda m: m[1] / m[2])
+        if value > budget:
+            self._over, self._under = self._over + 1, 0
+        elif value < budget * self.headroom:
+            self._over, self._under = 0, self._under + 1
+        else:
+            self._over = self._under = 0
+
+        level = self.level
+        if self._over >= self.patience and level + 1 < len(LEVELS):
+            level += 1
+        elif self._under >= self.patience_up and level > 0:
+            level -= 1
+        if level == self.level:
+            return None
+
+        self._over = self._under = 0
+        decision = {"from": self.level, "to": level, "measure": name, "value": value,
+                    "budget": budget, **LEVELS[level]}
+        self.level = level
+        self.decisions.append(decision)
+        unit = "ms" if name == "latency" else ""
+        print(f"Governor: {name} {value:.2f}{unit} vs budget {budget:.2f}{unit}, "
+              f"level {decision['from']} -> {level} ({self.describe()})", file=sys.stderr)
+        return decision
+
+    def describe(self):
+        s = self.settings
+        fps = f"{s['fps']} fps" if s["fps"] else "full rate"
+        return (f"{fps}, input {s['input']}, crop {s['crop']:.0%}, stride {s['stride']}, "
+                f"complexity {s['complexity']}")
+
+    def apply(self, cap, model):
+        """Applies the current level's frame rate, input sizes and stride, and starts a new window."""
+        s = self.settings
+        if hasattr(cap, "throttle"):
+            cap.throttle(fps=s["fps"])
+        roi = find_wrapper(model, RegionOfInterest)
+        if roi is not None:
+            roi.full_size = s["input"]
+            roi.set_input_size(round(roi.default_input_size * s["crop"]))
+        adaptive = find_wrapper(model, AdaptiveInference)
+        if adaptive is not None:
+            adaptive.min_stride = s["stride"]
+            adaptive.max_stride = max(adaptive.max_stride, s["stride"])
+            adaptive.stride = max(adaptive.stride, s["stride"])
+        self._reset(time.perf_counter())
@@ -0,0 +1,81 @@
+import cv2
+import numpy as np
+
+
+class IdleMode:
+    """Puts a live tracker in a low-power state while nobody is in frame.
+
+    After `idle_after` seconds without a detection the camera is throttled to
+    `idle_fps` frames a second at `idle_size` (see ThreadedCapture.throttle)
+    and the model stops running on every frame: probe() only lets a frame
+    through when the tiny motion probe sees movement, or every
+    `probe_interval` seconds. The first detection wakes the tracker and
+    restores the camera; until full-size frames arrive again, active() is
+    False so no metrics are taken from a low-resolution frame.
+    """
+
+    def __init__(self, cap, idle_after=5.0, idle_fps=4, idle_size=(320, 240),
+                 probe_interval=1.0, motion=4.0, probe_size=(64, 48)):
+        self.cap = cap
+        self.idle_after = idle_after
+        self.idle_fps = idle_fps
+        self.idle_size = idle_size
+        self.probe_interval = probe_interval
+        self.motion = motion
+        self.probe_size = probe_size
+
+        self.idle = False
+        self.last_seen = None
+        self.last_probe = None
+        self._shape = None  # shape of full-rate frames, to recognise them after waking
+
+        w, h = probe_size
+        self._small = np.empty((h, w, 3), dtype=np.uint8)
+        self._gray = np.empty((h, w), dtype=np.uint8)
+        self._prev_gray = np.empty((h, w), dtype=np.uint8)
+        self._diff = np.empty((h, w), dtype=np.uint8)
+        self._have_prev = False
+
+    def active(self, frame):
+        """False while idle, and for stale low-resolution frames just after waking."""
+        if self.idle:
+            return False
+        if self._shape is None:
+            self._shape = frame.shape
+        return frame.shape == self._shape
+
+    def probe(self, frame, now):
+        """While idle, whether this frame is worth running the model on."""
+        cv2.resize(frame, self.probe_size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        moved = False
+        if self._have_prev:
+            cv2.absdiff(self._gray, self._prev_gray, dst=self._diff)
+            moved = cv2.mean(self._diff)[0] > self.motion
+        self._gray, self._prev_gray = self._prev_gray, self._gray
+        self._have_prev = True
+        if moved or self.last_probe is None or now - self.last_probe >= self.probe_interval:
+            self.last_probe = now
+            return True
+        return False
+
+    def update(self, detected, now):
+        """Feeds whether someone was detected; returns "idle" or "active" on a change, else None."""
+        if self.last_seen is None or detected:
+            self.last_seen = now
+        if detected and self.idle:
+            self.idle = False
+            self.cap.throttle()
+            return "active"
+        if not self.idle and now - self.last_seen >= self.idle_after:
+            self.idle = True
+            self.last_probe = now
+            self._have_prev = False
+            self.cap.throttle(fps=self.idle_fps, size=self.idle_size)
+            return "idle"
+        return None
+
+    def close(self):
+        if self.idle:
+            self.idle = False
+            self.cap.throttle()
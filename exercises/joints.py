@@ -0,0 +1,117 @@
+"""Vectorized joint angles and distances over landmark arrays.
+
+A frame's landmarks are converted once into an (N, 4) float32 array of
+normalized x, y, z and visibility. A JointTable compiles the joint triplets
+and landmark pairs an exercise needs into index arrays, so every angle and
+distance for a frame comes out of a single numpy call. The same table works
+unchanged on (T, N, 4) traces for offline analysis.
+"""
+
+import numpy as np
+
+POSE_LANDMARK_NAMES = (
+    "NOSE", "LEFT_EYE_INNER", "LEFT_EYE", "LEFT_EYE_OUTER", "RIGHT_EYE_INNER",
+    "RIGHT_EYE", "RIGHT_EYE_OUTER", "LEFT_EAR", "RIGHT_EAR", "MOUTH_LEFT",
+    "MOUTH_RIGHT", "LEFT_SHOULDER", "RIGHT_SHOULDER", "LEFT_ELBOW", "RIGHT_ELBOW",
+    "LEFT_WRIST", "RIGHT_WRIST", "LEFT_PINKY", "RIGHT_PINKY", "LEFT_INDEX",
+    "RIGHT_INDEX", "LEFT_THUMB", "RIGHT_THUMB", "LEFT_HIP", "RIGHT_HIP",
+    "LEFT_KNEE", "RIGHT_KNEE", "LEFT_ANKLE", "RIGHT_ANKLE", "LEFT_HEEL",
+    "RIGHT_HEEL", "LEFT_FOOT_INDEX", "RIGHT_FOOT_INDEX",
+)
+
+HAND_LANDMARK_NAMES = (
+    "WRIST", "THUMB_CMC", "THUMB_MCP", "THUMB_IP", "THUMB_TIP",
+    "INDEX_FINGER_MCP", "INDEX_FINGER_PIP", "INDEX_FINGER_DIP", "INDEX_FINGER_TIP",
+    "MIDDLE_FINGER_MCP", "MIDDLE_FINGER_PIP", "MIDDLE_FINGER_DIP", "MIDDLE_FINGER_TIP",
+    "RING_FINGER_MCP", "RING_FINGER_PIP", "RING_FINGER_DIP", "RING_FINGER_TIP",
+    "PINKY_MCP", "PINKY_PIP", "PINKY_DIP", "PINKY_TIP",
+)
+
+POSE = {name: i for i, name in enumerate(POSE_LANDMARK_NAMES)}
+HAND = {name: i for i, name in enumerate(HAND_LANDMARK_NAMES)}
+
+
+def landmarks_to_array(landmark_list, out=None):
+    """Copies a landmark list into an (N, 4) float32 array, reusing `out` if given."""
+    landmarks = landmark_list.landmark
+    if out is None or len(out) != len(landmarks):
+        out = np.empty((len(landmarks), 4), dtype=np.float32)
+    for i, lm in enumerate(landmarks):
+        out[i] = (lm.x, lm.y, lm.z, lm.visibility)
+    return out
+
+
+def array_to_landmarks(points):
+    """The inverse of landmarks_to_array: a mediapipe NormalizedLandmarkList for drawing and the model wrappers."""
+    from mediapipe.framework.formats import landmark_pb2
+    landmark_list = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z, visibility in points:
+        landmark_list.landmark.add(x=x, y=y, z=z, visibility=visibility)
+    return landmark_list
+
+
+def _index(names, index):
+    return np.array([index[name] if isinstance(name, str) else name for name in names], dtype=np.intp)
+
+
+class JointTable:
+    """Precompiled angles and distances between named landmarks.
+
+    `angles` maps a name to a (first, vertex, last) triplet and `distances`
+    maps a name to a pair; landmarks are given by name or index. Values are
+    measured in pixels of a frame of size `scale` = (width, height), which
+    matches what the trackers compare their thresholds against.
+    """
+
+    def __init__(self, angles=None, distances=None, index=POSE):
+        angles = angles or {}
+        distances = distances or {}
+        self.angle_names = tuple(angles)
+        self.distance_names = tuple(distances)
+
+        triplets = list(angles.values())
+        self._a = _index([t[0] for t in triplets], index)
+        self._b = _index([t[1] for t in triplets], index)
+        self._c = _index([t[2] for t in triplets], index)
+
+        pairs = list(distances.values())
+        self._p = _index([p[0] for p in pairs], index)
+        self._q = _index([p[1] for p in pairs], index)
+
+    def angles(self, points, scale=(1.0, 1.0)):
+        """Angles in degrees, shape (..., len(angles)), for points of shape (..., N, 4)."""
+        scale = np.asarray(scale, dtype=np.float32)
+        xy = points[..., :2]
+        ba = (xy[..., self._a, :] - xy[..., self._b, :]) * scale
+        bc = (xy[..., self._c, :] - xy[..., self._b, :]) * scale
+        dot = (ba * bc).sum(axis=-1)
+        cross = ba[..., 0] * bc[..., 1] - ba[..., 1] * bc[..., 0]
+        return np.degrees(np.arctan2(np.abs(cross), dot))
+
+    def distances(self, points, scale=(1.0, 1.0)):
+        """Distances in pixels, shape (..., len(distances)), for points of shape (..., N, 4)."""
+        scale = np.asarray(scale, dtype=np.float32)
+        xy = points[..., :2]
+        delta = (xy[..., self._p, :] - xy[..., self._q, :]) * scale
+        return np.sqrt((delta * delta).sum(axis=-1))
+
+    def evaluate(self, points, scale=(1.0, 1.0)):
+        """Every angle and distance as a name -> value dict (values are arrays for traces)."""
+        values = dict(zip(self.angle_names, np.moveaxis(self.angles(points, scale), -1, 0)))
+        values.update(zip(self.distance_names, np.moveaxis(self.distances(points, scale), -1, 0)))
+        return values
+
+    def over_trace(self, trace, scale=None, chunk=65536):
+        """Angles and distances for a whole TraceReader, computed chunk by chunk.
+
+        Only `chunk` frames of the memory-mapped trace are touched at a time, so
+        multi-hour recordings never have to fit in RAM.
+        """
+        scale = trace.frame_size if scale is None else scale
+        angles = np.empty((len(trace), len(self.angle_names)), dtype=np.float32)
+        distances = np.empty((len(trace), len(self.distance_names)), dtype=np.float32)
+        for start in range(0, len(trace), chunk):
+            points = trace.landmarks[start:start + chunk]
+            angles[start:start + chunk] = self.angles(points, scale)
+            distances[start:start + chunk] = self.distances(points, scale)
+        return angles, distances
@@ -0,0 +1,106 @@
+"""Binary landmark traces.
+
+A trace file is a 32-byte header followed by one fixed-size float32 record per
+frame: the frame time in seconds since the start of the recording, then x, y,
+z and visibility for every landmark. Frames without a detection are stored as
+NaN. Because every record has the same stride, a trace can be memory-mapped
+and sliced without reading it into RAM, and a recording cut short by a crash
+is still readable up to its last complete frame.
+
+Header layout (little endian):
+    4s   magic b"FDTR"
+    H    format version
+    H    landmarks per frame (33 for pose, 21 for hands)
+    I    frame width
+    I    frame height
+    d    start time (Unix seconds)
+    8x   reserved
+"""
+
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b"FDTR"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIId8x")
+POSE_LANDMARKS = 33
+HAND_LANDMARKS = 21
+
+
+class TraceWriter:
+    """Appends per-frame landmarks to a trace file."""
+
+    def __init__(self, path, frame_size, num_landmarks=POSE_LANDMARKS, start_time=0.0):
+        width, height = frame_size
+        self.num_landmarks = num_landmarks
+        self.start_time = start_time
+        self.frames = 0
+        self._row = np.empty(1 + num_landmarks * 4, dtype="<f4")
+        self._file = open(path, "wb", buffering=1 << 16)
+        self._file.write(HEADER.pack(MAGIC, VERSION, num_landmarks, width, height, start_time))
+
+    def write(self, timestamp, landmarks=None):
+        """Records one frame; `landmarks` is a landmark list, an (N, 4) array or None."""
+        row = self._row
+        row[0] = timestamp - self.start_time
+        if landmarks is None:
+            row[1:] = np.nan
+        elif isinstance(landmarks, np.ndarray):
+            row[1:] = landmarks.reshape(-1)
+        else:
+            for i, lm in enumerate(landmarks.landmark):
+                row[1 + i * 4:5 + i * 4] = (lm.x, lm.y, lm.z, lm.visibility)
+        self._file.write(row.tobytes())
+        self.frames += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TraceReader:
+    """Memory-mapped view over a trace file.
+
+    `times` and `landmarks` are views into the mapped file, so slicing them only
+    touches the pages that are actually used.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            magic, version, num_landmarks, width, height, start_time = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a FitDesk landmark trace")
+        if version != VERSION:
+            raise ValueError(f"Unsupported trace version {version} in {path}")
+
+        self.path = path
+        self.num_landmarks = num_landmarks
+        self.frame_size = (width, height)
+        self.start_time = start_time
+
+        stride = 1 + num_landmarks * 4
+        frames = (os.path.getsize(path) - HEADER.size) // (stride * 4)
+        if frames > 0:
+            self.records = np.memmap(path, dtype="<f4", mode="r", offset=HEADER.size,
+                                     shape=(frames, stride))
+        else:
+            self.records = np.empty((0, stride), dtype="<f4")
+        self.times = self.records[:, 0]
+        self.landmarks = self.records[:, 1:].reshape(frames, num_landmarks, 4)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.times[index], self.landmarks[index]
+
+    def timestamps(self, start=None, stop=None):
+        """Absolute frame times for a slice of the trace, as float64."""
+        return self.start_time + self.times[start:stop].astype(np.float64)
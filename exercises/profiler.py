@@ -0,0 +1,143 @@
+"""Per-stage latency measurement for the tracking loop.
+
+    profiler = Profiler()
+    while ...:
+        with profiler.span("read"):
+            ret, frame = cap.read()
+        ...
+        profiler.draw_hud(frame)
+        profiler.frame_done()
+    profiler.dump("profile.json")
+
+Each stage keeps its last `window` durations in a fixed numpy ring, so
+recording a span allocates nothing; percentiles are only computed when the
+HUD or a summary asks for them. A disabled profiler hands out one shared
+no-op span, which costs about as much as an empty `with` block.
+"""
+
+import json
+import time
+
+import cv2
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, ring):
+        self.ring = ring
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.ring.add(time.perf_counter_ns() - self.start)
+        return False
+
+
+class _Ring:
+    def __init__(self, size):
+        self.values = np.zeros(size, dtype=np.int64)
+        self.count = 0
+        self.total = 0
+
+    def add(self, ns):
+        self.values[self.count % len(self.values)] = ns
+        self.count += 1
+        self.total += ns
+
+    def recent(self):
+        return self.values[:min(self.count, len(self.values))]
+
+
+class Profiler:
+    def __init__(self, enabled=True, hud=False, window=300, hud_interval=0.5):
+        self.enabled = enabled
+        self.hud = hud
+        self.window = window
+        self.hud_interval = hud_interval
+        self.started = time.perf_counter()
+        self.frames = 0
+        self.startup = {}  # milestone -> seconds, from engine.Session.startup_report()
+        self._rings = {}
+        self._spans = {}
+        self._frame_ring = _Ring(window)
+        self._last_frame = None
+        self._hud_lines = []
+        self._hud_time = 0.0
+
+    def span(self, name):
+        """Context manager timing one stage of the current frame."""
+        if not self.enabled:
+            return _NULL_SPAN
+        span = self._spans.get(name)
+        if span is None:
+            self._rings[name] = _Ring(self.window)
+            span = self._spans[name] = _Span(self._rings[name])
+        return span
+
+    def frame_done(self):
+        """Marks the end of a loop iteration; frame-to-frame time gives the FPS."""
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        if self._last_frame is not None:
+            self._frame_ring.add(now - self._last_frame)
+        self._last_frame = now
+        self.frames += 1
+
+    def stats(self):
+        """name -> {"count", "mean_ms", "p50_ms", "p95_ms", "p99_ms"} over the rolling window."""
+        stats = {}
+        for name, ring in list(self._rings.items()) + [("frame", self._frame_ring)]:
+            recent = ring.recent()
+            if not len(recent):
+                continue
+            entry = {"count": ring.count, "mean_ms": ring.total / ring.count / 1e6}
+            for p, value in zip(PERCENTILES, np.percentile(recent, PERCENTILES)):
+                entry[f"p{p}_ms"] = value / 1e6
+            stats[name] = entry
+        return stats
+
+    def fps(self):
+        recent = self._frame_ring.recent()
+        return 1e9 / recent.mean() if len(recent) else 0.0
+
+    def draw_hud(self, frame):
+        """Draws FPS and per-stage p50/p95 in the frame's top-right corner."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if now - self._hud_time >= self.hud_interval:
+            self._hud_time = now
+            self._hud_lines = [f"{self.fps():5.1f} fps"] + [
+                f"{name:<8}{s['p50_ms']:6.1f}{s['p95_ms']:6.1f} ms"
+                for name, s in self.stats().items() if name != "frame"]
+        x = frame.shape[1] - 230
+        for i, line in enumerate(self._hud_lines):
+            y = 20 + 18 * i
+            cv2.putText(frame, line, (x, y), cv2.FONT_HERSHEY_PLAIN, 1.0, (0, 0, 0), 3)
+            cv2.putText(frame, line, (x, y), cv2.FONT_HERSHEY_PLAIN, 1.0, (255, 255, 255), 1)
+
+    def summary(self):
+        return {"frames": self.frames, "seconds": time.perf_counter() - self.started,
+                "fps": self.fps(), "window": self.window, "stages": self.stats(),
+                "startup": self.startup}
+
+    def dump(self, path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
@@ -0,0 +1,137 @@
+"""Live tracker progress shared through a small memory-mapped record.
+
+A tracker publishes its exercise, rep count, phase, frame rate and errors
+into one fixed-size record that any process on the host can map and read.
+Writes never block: the record is overwritten in place, so a slow reader
+simply sees the latest state. A sequence number that is odd while a write is
+in progress (a seqlock) lets readers detect and retry torn reads.
+
+Publishing is throttled to `interval` seconds, except that changes in the
+rep count, state or error go out immediately.
+"""
+
+import mmap
+import os
+import stat
+import struct
+import tempfile
+import time
+
+
+def _default_run_dir():
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return os.path.join(os.environ["XDG_RUNTIME_DIR"], "fitdesk")
+    if hasattr(os, "getuid"):
+        return os.path.join(tempfile.gettempdir(), f"fitdesk-{os.getuid()}")
+    # Windows: the temp directory is already per user
+    return os.path.join(tempfile.gettempdir(), "fitdesk")
+
+
+RUN_DIR = _default_run_dir()
+
+
+def private_dir(path=RUN_DIR):
+    """Creates `path` for this user only, or checks that an existing one is ours and private.
+
+    Everything shared between the app, the launcher and the trackers lives
+    here, so another user must not be able to pre-create, read or plant files in it.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if hasattr(os, "getuid"):
+        info = os.lstat(path)
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+            raise PermissionError(f"{path} is not a directory owned by this user")
+        if info.st_mode & 0o077:
+            os.chmod(path, 0o700)
+    return path
+
+
+SEQ = struct.Struct("<Q")
+# updated, pid, reps, target, fps, state, phase, exercise, error
+BODY = struct.Struct("<diiif12s20s32s128s")
+SIZE = SEQ.size + BODY.size
+
+FIELDS = ("updated", "pid", "reps", "target", "fps", "state", "phase", "exercise", "error")
+
+
+def channel_path(name, run_dir=RUN_DIR):
+    return os.path.join(run_dir, f"progress-{name}.bin")
+
+
+def _text(value, size):
+    return str(value or "").encode("utf-8")[:size]
+
+
+class ProgressWriter:
+    def __init__(self, name="worker", interval=0.25, run_dir=RUN_DIR):
+        self.interval = interval
+        self.path = channel_path(name, run_dir)
+        private_dir(run_dir)
+        with open(self.path, "a+b") as f:
+            f.truncate(SIZE)
+            self._map = mmap.mmap(f.fileno(), SIZE)
+        self._seq = SEQ.unpack_from(self._map)[0] & ~1
+        self._last = 0.0
+        self.values = {"pid": os.getpid(), "reps": 0, "target": 0, "fps": 0.0,
+                       "state": "idle", "phase": "", "exercise": "", "error": ""}
+
+    def update(self, force=False, **values):
+        """Merges `values` into the record and publishes it if due."""
+        urgent = force or any(values.get(k, self.values[k]) != self.values[k]
+                              for k in ("reps", "state", "error"))
+        self.values.update(values)
+        now = time.time()
+        if urgent or now - self._last >= self.interval:
+            self._write(now)
+
+    def _write(self, now):
+        v = self.values
+        self._seq += 1
+        SEQ.pack_into(self._map, 0, self._seq)
+        BODY.pack_into(self._map, SEQ.size, now, v["pid"], v["reps"], v["target"] or 0, v["fps"],
+                       _text(v["state"], 12), _text(v["phase"], 20), _text(v["exercise"], 32),
+                       _text(v["error"], 128))
+        self._seq += 1
+        SEQ.pack_into(self._map, 0, self._seq)
+        self._last = now
+
+    def close(self):
+        self.update(force=True, state="stopped", fps=0.0)
+        self._map.close()
+
+
+class ProgressReader:
+    def __init__(self, name="worker", run_dir=RUN_DIR):
+        self.run_dir = run_dir
+        self.path = channel_path(name, run_dir)
+        self._map = None
+
+    def read(self, retries=100):
+        """Latest published record as a dict, or None if nothing has been published."""
+        if self._map is None:
+            try:
+                private_dir(self.run_dir)
+                with open(self.path, "rb") as f:
+                    self._map = mmap.mmap(f.fileno(), SIZE, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                return None
+
+        for _ in range(retries):
+            before = SEQ.unpack_from(self._map)[0]
+            if before == 0:
+                return None
+            if before & 1:
+                continue
+            body = BODY.unpack_from(self._map, SEQ.size)
+            if SEQ.unpack_from(self._map)[0] == before:
+                record = dict(zip(FIELDS, body))
+                for key in ("state", "phase", "exercise", "error"):
+                    record[key] = record[key].rstrip(b"\0").decode("utf-8", "replace")
+                record["age"] = time.time() - record["updated"]
+                return record
+        return None
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
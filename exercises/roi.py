@@ -0,0 +1,219 @@
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from joints import POSE
+
+
+class RegionOfInterest:
+    """Feeds the model a small crop around the person instead of the whole frame.
+
+    Takes BGR frames. The previous frame's landmarks give a bounding box, which
+    is padded, squared and kept fixed until the person moves close to its edge,
+    so the model sees a stable view. The crop is resized to the model's native
+    input size and only then converted to RGB; the resulting landmarks are
+    mapped back to full-frame coordinates in place. When nothing is tracked the
+    whole frame is used, shrunk to `full_size` on its long side. The crop is
+    dropped whenever the frame size changes (e.g. the camera is throttled for
+    idle mode and restored), and reset() drops it on demand.
+    """
+
+    def __init__(self, model, input_size=256, full_size=640, margin=0.3, min_visibility=0.5):
+        self.model = model
+        self.default_input_size = input_size
+        self.input_size = None
+        self.full_size = full_size
+        self.margin = margin
+        self.min_visibility = min_visibility
+        self.crop = None  # (x0, y0, side) in pixels of a frame of `_frame_size`
+        self._frame_size = None
+
+        self._full_small = None
+        self._full_rgb = None
+        self.set_input_size(input_size)
+
+    def set_input_size(self, size):
+        """Changes the size crops are resized to for the model (see governor.Governor)."""
+        if size != self.input_size:
+            self.input_size = size
+            self._small = np.empty((size, size, 3), dtype=np.uint8)
+            self._patch = np.empty((size, size, 3), dtype=np.uint8)
+
+    def reset(self):
+        """Forgets the tracked crop, so the next frame is searched whole."""
+        self.crop = None
+
+    def _resize(self, w, h):
+        # A crop in another frame size's pixels would select the wrong region
+        if self._frame_size != (w, h):
+            self._frame_size = (w, h)
+            self.reset()
+
+    def process(self, frame):
+        h, w = frame.shape[:2]
+        self._resize(w, h)
+        if self.crop is not None:
+            results = self._run_crop(frame, w, h)
+            if not _landmark_lists(results):
+                self.crop = None
+        if self.crop is None:
+            results = self._run_full(frame, w, h)
+        self._update_crop(results, w, h)
+        return results
+
+    def _run_full(self, frame, w, h, model=None):
+        scale = min(1.0, self.full_size / max(w, h))
+        size = (round(w * scale), round(h * scale))
+        if self._full_rgb is None or self._full_rgb.shape[:2] != (size[1], size[0]):
+            self._full_small = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            self._full_rgb = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        if scale < 1.0:
+            cv2.resize(frame, size, dst=self._full_small, interpolation=cv2.INTER_AREA)
+            cv2.cvtColor(self._full_small, cv2.COLOR_BGR2RGB, dst=self._full_rgb)
+        else:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._full_rgb)
+        # Normalized coordinates are unaffected by a uniform resize.
+        return (model or self.model).process(self._full_rgb)
+
+    def _run_crop(self, frame, w, h):
+        x0, y0, side = self.crop
+        cv2.resize(frame[y0:y0 + side, x0:x0 + side], (self.input_size, self.input_size),
+                   dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2RGB, dst=self._patch)
+        results = self.model.process(self._patch)
+
+        for landmark_list in _landmark_lists(results):
+            for lm in landmark_list.landmark:
+                lm.x = (lm.x * side + x0) / w
+                lm.y = (lm.y * side + y0) / h
+                lm.z = lm.z * side / w
+        return results
+
+    def _update_crop(self, results, w, h):
+        lists = _landmark_lists(results)
+        if not lists:
+            self.crop = None
+            return
+
+        points = [(lm.x * w, lm.y * h) for lm in lists[0].landmark
+                  if not lm.HasField("visibility") or lm.visibility >= self.min_visibility]
+        if len(points) < 2:
+            self.crop = None
+            return
+        xs, ys = zip(*points)
+        left, right = max(min(xs), 0), min(max(xs), w)
+        top, bottom = max(min(ys), 0), min(max(ys), h)
+
+        if self.crop is not None:
+            x0, y0, side = self.crop
+            inset = side * self.margin / (1 + 2 * self.margin) / 2
+            inside = (left >= x0 + inset and right <= x0 + side - inset
+                      and top >= y0 + inset and bottom <= y0 + side - inset)
+            if inside and max(right - left, bottom - top) > side * 0.4:
+                return
+
+        side = max(right - left, bottom - top) * (1 + 2 * self.margin)
+        side = int(min(max(side, self.input_size), w, h))
+        cx, cy = (left + right) / 2, (top + bottom) / 2
+        x0 = int(min(max(cx - side / 2, 0), w - side))
+        y0 = int(min(max(cy - side / 2, 0), h - side))
+        self.crop = (x0, y0, side)
+
+    def close(self):
+        self.model.close()
+
+
+def _landmark_lists(results):
+    if getattr(results, "pose_landmarks", None) is not None:
+        return [results.pose_landmarks]
+    return list(getattr(results, "multi_hand_landmarks", None) or [])
+
+
+class PoseSeededHands(RegionOfInterest):
+    """Hand tracking that finds the hand through the pose model instead of palm detection.
+
+    Takes BGR frames. While a hand is tracked the hands model only sees the
+    crop around it, as with RegionOfInterest. Once the hand is lost, the pose
+    model runs every `pose_stride` frames on the shrunk full frame and the
+    crop is placed over its most visible wrist and knuckles, so the hands
+    model's palm detection only ever runs on that small crop. When pose finds
+    no body at all (e.g. the hand is too close to the camera for one to be
+    seen) the hands model gets the full frame on those frames instead. `runs`
+    counts what ran.
+    """
+
+    def __init__(self, model, pose, pose_stride=5, input_size=224, full_size=640, margin=0.5,
+                 min_visibility=0.5):
+        super().__init__(model, input_size=input_size, full_size=full_size, margin=margin,
+                         min_visibility=min_visibility)
+        self.pose = pose
+        self.pose_stride = pose_stride
+        self.runs = {"hands_crop": 0, "hands_full": 0, "pose": 0}
+        self._wait = 0
+        self._empty = SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+
+    def reset(self):
+        super().reset()
+        self._wait = 0
+
+    def process(self, frame):
+        h, w = frame.shape[:2]
+        self._resize(w, h)
+        if self.crop is not None:
+            results = self._track(frame, w, h)
+            if results is not None:
+                return results
+        if self._wait > 0:
+            self._wait -= 1
+            return self._empty
+        self._wait = self.pose_stride - 1
+
+        self.runs["pose"] += 1
+        pose_results = self._run_full(frame, w, h, self.pose)
+        if pose_results.pose_landmarks is not None:
+            # A body without a visible wrist has no hand in view either
+            self.crop = self._crop_from_pose(pose_results.pose_landmarks.landmark, w, h)
+            if self.crop is None:
+                return self._empty
+            return self._track(frame, w, h) or self._empty
+        self.runs["hands_full"] += 1
+        results = self._run_full(frame, w, h)
+        self._update_crop(results, w, h)
+        return results
+
+    def _track(self, frame, w, h):
+        self.runs["hands_crop"] += 1
+        results = self._run_crop(frame, w, h)
+        if not _landmark_lists(results):
+            self.crop = None
+            return None
+        self._update_crop(results, w, h)
+        return results
+
+    def _crop_from_pose(self, landmarks, w, h):
+        wrists = [side for side in ("LEFT", "RIGHT")
+                  if landmarks[POSE[side + "_WRIST"]].visibility >= self.min_visibility]
+        if not wrists:
+            return None
+        side = max(wrists, key=lambda s: landmarks[POSE[s + "_WRIST"]].visibility)
+        wrist = landmarks[POSE[side + "_WRIST"]]
+        index, pinky = landmarks[POSE[side + "_INDEX"]], landmarks[POSE[side + "_PINKY"]]
+        wx, wy = wrist.x * w, wrist.y * h
+        kx, ky = (index.x + pinky.x) / 2 * w, (index.y + pinky.y) / 2 * h
+
+        if (np.isfinite([kx, ky]).all() and index.visibility >= self.min_visibility
+                and pinky.visibility >= self.min_visibility):
+            # The fingers reach about as far again past the knuckles
+            size = int(min(max(4 * np.hypot(kx - wx, ky - wy), self.input_size), w, h))
+        else:
+            # Backends without hand points (e.g. MoveNet): a fixed crop on the wrist
+            kx, ky = wx, wy
+            size = int(min(self.input_size, w, h))
+        x0 = int(min(max(kx - size / 2, 0), w - size))
+        y0 = int(min(max(ky - size / 2, 0), h - size))
+        return (x0, y0, size)
+
+    def close(self):
+        super().close()
+        self.pose.close()
@@ -0,0 +1,88 @@
+import cv2
+import numpy as np
+
+
+class AdaptiveInference:
+    """Runs the wrapped model only every `stride` frames, adapting the stride to motion.
+
+    Motion is the absolute difference between consecutive frames after
+    shrinking them to a tiny grayscale probe, averaged over `block` x `block`
+    probe pixels and taken where that is largest, which costs a fraction of a
+    millisecond; a curling forearm or a head turn covers too little of the
+    frame to show in a mean over all of it. While the user holds still the
+    stride grows towards `max_stride` and the last landmarks are carried forward; as soon as motion
+    rises above `high_motion` the model runs on that same frame and the stride
+    drops back to `min_stride`, so rep detection is never delayed. Frames are
+    passed through to the wrapped model unchanged.
+    """
+
+    def __init__(self, model, min_stride=1, max_stride=6, low_motion=1.5, high_motion=6.0,
+                 probe_size=(64, 48), block=8):
+        self.model = model
+        self.min_stride = min_stride
+        self.max_stride = max_stride
+        self.low_motion = low_motion
+        self.high_motion = high_motion
+        self.probe_size = probe_size
+        self.block = block
+
+        self.stride = min_stride
+        self.motion = 0.0
+        self.frames = 0
+        self.inferences = 0
+
+        w, h = probe_size
+        self._small = np.empty((h, w, 3), dtype=np.uint8)
+        self._gray = np.empty((h, w), dtype=np.uint8)
+        self._prev_gray = np.empty((h, w), dtype=np.uint8)
+        self._diff = np.empty((h, w), dtype=np.uint8)
+        self._local = np.empty((h, w), dtype=np.float32)
+        self._have_prev = False
+        self._since_inference = 0
+        self._results = None
+        self._force = False
+
+    def _measure_motion(self, image):
+        cv2.resize(image, self.probe_size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        if self._have_prev:
+            cv2.absdiff(self._gray, self._prev_gray, dst=self._diff)
+            cv2.boxFilter(self._diff, cv2.CV_32F, (self.block, self.block), dst=self._local)
+            self.motion = cv2.minMaxLoc(self._local)[1]
+        self._gray, self._prev_gray = self._prev_gray, self._gray
+        self._have_prev = True
+
+    def process(self, image):
+        self.frames += 1
+        self._measure_motion(image)
+
+        if self.motion > self.high_motion:
+            self.stride = self.min_stride
+        elif self.motion < self.low_motion:
+            self.stride = min(self.stride + 1, self.max_stride)
+        else:
+            self.stride = max(self.stride - 1, self.min_stride)
+
+        self._since_inference += 1
+        if (self._results is None or self._force or self.motion > self.high_motion
+                or self._since_inference >= self.stride):
+            self._results = self.model.process(image)
+            self._since_inference = 0
+            self._force = False
+            self.inferences += 1
+        return self._results
+
+    def reset(self):
+        """Drops the cached results and motion history, as after a gap in the video."""
+        self.stride = self.min_stride
+        self.motion = 0.0
+        self._have_prev = False
+        self._since_inference = 0
+        self._results = None
+
+    def infer_next(self):
+        """Makes the next process() run the model, however still the scene is."""
+        self._force = True
+
+    def close(self):
+        self.model.close()
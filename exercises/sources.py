@@ -0,0 +1,254 @@
+import argparse
+import os
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from camera import ThreadedCapture
+from frames import MirroredModel
+from joints import array_to_landmarks
+from landmark_trace import HAND_LANDMARKS, POSE_LANDMARKS, TraceReader, TraceWriter
+from roi import PoseSeededHands, RegionOfInterest
+from scheduler import AdaptiveInference
+
+TRACE_EXTENSIONS = (".fdt",)
+
+
+class VideoFileSource:
+    """Plays a recorded video through the tracker loop as fast as it is consumed.
+
+    Every frame is handed out in order (nothing is dropped), and clock() returns
+    the frame's position in the video rather than wall time, so a session
+    replays identically no matter how fast the machine is.
+    """
+
+    live = False
+
+    def __init__(self, path):
+        self.cap = cv2.VideoCapture(path)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.frame_index = -1
+        self.frame_time = None
+        self._frame = None
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        ret, frame = self.cap.read(self._frame)
+        if not ret:
+            return False, None
+        self._frame = frame
+        self.frame_index += 1
+        self.frame_time = self.frame_index / self.fps
+        return True, frame
+
+    def clock(self):
+        return self.frame_time or 0.0
+
+    def release(self):
+        self.cap.release()
+
+
+class TraceSource:
+    """Replays a recorded landmark trace instead of running a camera and a model.
+
+    read() returns a blank frame of the recorded size and replay_model() stands
+    in for the pose or hands model, answering with the landmarks stored for the
+    current frame.
+    """
+
+    live = False
+
+    def __init__(self, path):
+        self.trace = TraceReader(path)
+        self.landmarks = self.trace.landmarks
+        width, height = self.trace.frame_size
+        self._blank = np.zeros((height, width, 3), dtype=np.uint8)
+        self.frame_index = -1
+        self.frame_time = None
+
+    def isOpened(self):
+        return self.frame_index + 1 < len(self.trace)
+
+    def read(self):
+        if not self.isOpened():
+            return False, None
+        self.frame_index += 1
+        self.frame_time = self.trace.start_time + float(self.trace.times[self.frame_index])
+        self._blank.fill(0)
+        return True, self._blank
+
+    def clock(self):
+        return self.frame_time if self.frame_time is not None else self.trace.start_time
+
+    def release(self):
+        pass
+
+    def replay_model(self):
+        return ReplayModel(self)
+
+
+class ReplayModel:
+    """Answers process() with the landmarks recorded for the current trace frame."""
+
+    def __init__(self, source):
+        self._source = source
+
+    def process(self, image):
+        points = self._source.landmarks[self._source.frame_index]
+        if np.isnan(points).any():
+            return SimpleNamespace(pose_landmarks=None, multi_hand_landmarks=None)
+
+        landmark_list = array_to_landmarks(points)
+        if len(points) == POSE_LANDMARKS:
+            return SimpleNamespace(pose_landmarks=landmark_list, multi_hand_landmarks=None)
+        return SimpleNamespace(pose_landmarks=None, multi_hand_landmarks=[landmark_list])
+
+    def close(self):
+        pass
+
+
+class TraceRecorder:
+    """The trace file a capture's landmarks are recorded to, shared by all its models.
+
+    The file is opened on the first recorded frame, so every model built on
+    the capture (e.g. after the governor swaps complexity) appends to the same
+    trace instead of truncating it. A trace holds one kind of landmarks, so a
+    model with a different landmark count can't record into it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.num_landmarks = None
+        self._writer = None
+
+    def write(self, cap, image, num_landmarks, landmarks):
+        if self._writer is None:
+            h, w = image.shape[:2]
+            self._writer = TraceWriter(self.path, (w, h), num_landmarks, start_time=cap.clock())
+            self.num_landmarks = num_landmarks
+        elif num_landmarks != self.num_landmarks:
+            raise ValueError(f"{self.path} records {self.num_landmarks} landmarks per frame, "
+                             f"not {num_landmarks}: record pose and hands to separate traces")
+        self._writer.write(cap.clock(), landmarks)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class RecordingModel:
+    """Wraps a pose/hands model and writes every result to the capture's TraceRecorder."""
+
+    def __init__(self, model, cap, num_landmarks):
+        self.model = model
+        self._cap = cap
+        self._num_landmarks = num_landmarks
+
+    def process(self, image):
+        results = self.model.process(image)
+        landmarks = getattr(results, "pose_landmarks", None)
+        if landmarks is None and getattr(results, "multi_hand_landmarks", None):
+            landmarks = results.multi_hand_landmarks[0]
+        self._cap.record.write(self._cap, image, self._num_landmarks, landmarks)
+        return results
+
+    def close(self):
+        self._cap.record.close()
+        self.model.close()
+
+
+def open_source(source=0, record=None):
+    """Opens a camera index, a video file or a landmark trace for a tracker loop.
+
+    With `record` set to a file path, the models load_model() builds on the
+    capture save every frame's landmarks to that path as one trace (see
+    TraceRecorder).
+    """
+    if isinstance(source, int) or str(source).isdigit():
+        cap = ThreadedCapture(int(source))
+    elif not os.path.exists(source):
+        raise FileNotFoundError(f"No camera, video or trace at {source}")
+    elif source.lower().endswith(TRACE_EXTENSIONS):
+        cap = TraceSource(source)
+    else:
+        cap = VideoFileSource(source)
+    cap.record = TraceRecorder(record) if record else None
+    return cap
+
+
+def find_wrapper(model, cls):
+    """The `cls` layer of a model built by load_model(), or None."""
+    while model is not None and not isinstance(model, cls):
+        model = getattr(model, "model", None)
+    return model
+
+
+def reset_model(model):
+    """Resets the wrappers of a model built by load_model() that keep state between frames."""
+    # The innermost model, which has no `model` of its own, is left alone
+    while hasattr(model, "model"):
+        if hasattr(model, "reset"):
+            model.reset()
+        model = model.model
+
+
+def load_model(cap, factory, adaptive=False, roi=False, mirror=False, seed=None, **kwargs):
+    """Builds the pose/hands model, or a replay stand-in when the source is a trace.
+
+    With `roi` set, the model takes BGR frames and only sees a crop around the
+    person (see roi.RegionOfInterest); otherwise it takes RGB frames. With
+    `mirror` set, the model takes unmirrored frames and reports landmarks for
+    the mirrored view (see frames.MirroredModel). With `adaptive` set,
+    inference is skipped on low-motion frames (see
+    scheduler.AdaptiveInference). `seed` builds a pose model to find hands
+    with, in place of `roi` (see roi.PoseSeededHands); the model then takes BGR
+    frames too. Traces are recorded in the mirrored view and are always
+    replayed frame by frame.
+    """
+    if isinstance(cap, TraceSource):
+        model = cap.replay_model()
+    else:
+        model = factory(**kwargs)
+        if seed is not None:
+            model = PoseSeededHands(model, seed())
+        elif roi:
+            model = RegionOfInterest(model)
+        if mirror:
+            model = MirroredModel(model)
+        if adaptive:
+            model = AdaptiveInference(model)
+    if cap.record:
+        num_landmarks = HAND_LANDMARKS if factory.__name__ == "Hands" else POSE_LANDMARKS
+        model = RecordingModel(model, cap, num_landmarks)
+    return model
+
+
+def parse_args(reps=None, description=None, exercises=None, profile=False, budget=False):
+    parser = argparse.ArgumentParser(description=description)
+    if exercises is not None:
+        parser.add_argument("exercise", choices=sorted(exercises))
+    if reps is not None:
+        parser.add_argument("reps", nargs="?", type=int, default=reps,
+                            help="Number of repetitions")
+    parser.add_argument("--source", default="0",
+                        help="Camera index, video file or recorded landmark trace")
+    parser.add_argument("--record", metavar="PATH",
+                        help="Save the detected landmarks to a trace file")
+    parser.add_argument("--headless", action="store_true",
+                        help="No window or speech; print events as JSON lines instead")
+    if profile:
+        parser.add_argument("--profile", action="store_true",
+                            help="Show per-stage timings on the video")
+        parser.add_argument("--profile-json", metavar="PATH",
+                            help="Write per-stage timing percentiles to a JSON file at exit")
+    if budget:
+        parser.add_argument("--cpu-budget", type=float, metavar="SHARE",
+                            help="Keep CPU use under this share of the machine (0-1) by lowering "
+                                 "frame rate and model cost")
+        parser.add_argument("--latency-budget", type=float, metavar="MS",
+                            help="Keep per-frame processing under this many milliseconds")
+    return parser.parse_args()
@@ -0,0 +1,438 @@
+"""Exercise definitions run by engine.py.
+
+Each exercise is a dict:
+
+    title        window title
+    model        "pose" or "hands"
+    seed         "pose" finds the hand from the pose model's wrist instead of
+                 palm detection on the full frame (hands only)
+    confidence   detection/tracking confidence for the model (default 0.5)
+    reps         default target; hold exercises use `hold` instead
+    metrics      name -> definition, evaluated in order:
+                   ("angle", a, b, c)    angle at b in degrees, in pixels
+                   ("distance", a, b)    distance in pixels
+                   ("x", a) / ("y", a)   pixel coordinate
+                   ("nx", a) / ("ny", a) normalized coordinate
+                   ("mean" | "min" | "max", m1, m2, ...)
+                   ("diff", m1, m2)      m1 - m2
+                   ("absdiff", m1, m2)   |m1 - m2|
+    show         on-screen label -> metric
+    calibration  steps run before counting, each holding still for `seconds`
+                 while `metric` is sampled; `reduce` plus `offset` becomes the
+                 parameter `param`, where "last" is the median of the last
+                 second, "min"/"max" the 5th/95th percentile and "median" the
+                 median of the step. With `settle`, a step ends as soon as
+                 that many seconds of samples are `steady` (5th to 95th
+                 percentile within that many units, default 6)
+                 and, with `away`, that far from the first step's median in
+                 the direction of `reduce`. `phase` is the phase reps start
+                 in when calibration ends on that step, since the user is
+                 still holding it then
+    check        skips calibration when a saved profile still fits: the first
+                 step's metric is sampled for `seconds` and compared with the
+                 saved resting value within `tolerance`; say, text, drifted
+    start        initial phase
+    transitions  tried in order, first match wins:
+                   from       phase or list of phases
+                   to         next phase
+                   when       predicates (metric, op, value[, offset]); value
+                              is a number or a calibrated parameter
+                   min_time   seconds the current phase must have lasted
+                   cooldown   seconds since the last counted rep
+                   count      counts a rep when taken
+    hold         timed hold instead of reps: when, seconds, cues,
+                 reset_on_loss, start_say, lost_say
+    sides        side -> exercise: tracks both sides from one inference per
+                 frame, each with its own rep or hold state; the exercise is
+                 done when every side is, and `reps` is per side. "left" and
+                 "right" are the user's own sides
+    guides       ("hline" | "vline", names...) lines drawn at the sum of
+                 metric/parameter values
+    highlight    landmarks marked with a dot
+    intro, calibrated, finish, stop, missing, rep_say
+                 speech and on-screen text
+"""
+
+
+def _bicep_curl(side, title, intro, finish):
+    return {
+        "title": title,
+        "model": "pose",
+        "reps": 10,
+        "metrics": {
+            "angle": ("angle", f"{side}_SHOULDER", f"{side}_ELBOW", f"{side}_WRIST"),
+        },
+        "show": {"Angle": "angle"},
+        "start": "down",
+        "transitions": [
+            {"from": "down", "to": "up", "when": [("angle", "<", 40)]},
+            {"from": "up", "to": "down", "when": [("angle", ">", 160)], "count": True},
+        ],
+        "intro": intro,
+        "finish": finish,
+    }
+
+
+def _arm_rotation(side, title, intro, finish):
+    return {
+        "title": title,
+        "model": "pose",
+        "reps": 10,
+        "metrics": {
+            "angle": ("angle", f"{side}_SHOULDER", f"{side}_ELBOW", f"{side}_WRIST"),
+        },
+        "show": {"Angle": "angle"},
+        "start": "ready",
+        "transitions": [
+            {"from": ["ready", "up"], "to": "down", "when": [("angle", ">", 160)]},
+            {"from": "down", "to": "up", "when": [("angle", "<", 40)], "count": True},
+        ],
+        "intro": intro,
+        "finish": finish,
+    }
+
+
+def _tree_pose(bent, straight, title, intro):
+    return {
+        "title": title,
+        "model": "pose",
+        "metrics": {
+            "bent_leg": ("angle", f"{bent}_HIP", f"{bent}_KNEE", f"{bent}_ANKLE"),
+            "straight_leg": ("angle", f"{straight}_HIP", f"{straight}_KNEE", f"{straight}_ANKLE"),
+            "knee_out": ("angle", f"{bent}_SHOULDER", f"{bent}_HIP", f"{bent}_KNEE"),
+            "ankle_x": ("x", f"{bent}_ANKLE"),
+            "ankle_y": ("y", f"{bent}_ANKLE"),
+            "knee_x": ("x", f"{straight}_KNEE"),
+            "knee_y": ("y", f"{straight}_KNEE"),
+            "ankle_knee_dx": ("absdiff", "ankle_x", "knee_x"),
+            "ankle_knee_dy": ("absdiff", "ankle_y", "knee_y"),
+        },
+        "show": {
+            f"{bent.title()} Leg Angle": "bent_leg",
+            f"{straight.title()} Leg Angle": "straight_leg",
+        },
+        "hold": {
+            "when": [
+                ("ankle_knee_dy", "<", 80),
+                ("ankle_knee_dx", "<", 100),
+                ("knee_out", ">", 40),
+                ("straight_leg", ">", 160),
+            ],
+            "seconds": 60,
+            "cues": [(45, "Almost there, keep holding.")],
+            "reset_on_loss": True,
+            "start_say": "Pose detected. Starting timer.",
+            "lost_say": "Pose lost. Please get back into Tree Pose.",
+        },
+        "intro": intro,
+        "finish": "One minute completed. Great job!",
+    }
+
+
+EXERCISES = {
+    "squats": {
+        "title": "Squat Tracker",
+        "model": "pose",
+        "confidence": 0.7,
+        "reps": 10,
+        "warmup": 2,
+        "counter": "Squats",
+        "metrics": {
+            "right_knee": ("angle", "RIGHT_HIP", "RIGHT_KNEE", "RIGHT_ANKLE"),
+            "left_knee": ("angle", "LEFT_HIP", "LEFT_KNEE", "LEFT_ANKLE"),
+            "knee_angle": ("mean", "right_knee", "left_knee"),
+        },
+        "show": {"Avg Angle": "knee_angle"},
+        "start": "up",
+        "transitions": [
+            {"from": "up", "to": "down", "when": [("knee_angle", "<", 85)]},
+            {"from": "down", "to": "up", "when": [("knee_angle", ">", 165)],
+             "cooldown": 0.6, "count": True},
+        ],
+        "intro": "Start squats. Go down fully and come back up.",
+        "finish": "Workout complete. Great job!",
+        "stop": "Exercise stopped.",
+    },
+
+    "bicep_curl_left": _bicep_curl(
+        "LEFT", "Left Arm Bicep Curl Tracker",
+        "Start your left arm bicep curls when you're ready.",
+        "Exercise completed. Well done!"),
+
+    "bicep_curl_right": _bicep_curl(
+        "RIGHT", "Right Arm Bicep Curl Tracker",
+        "Start your right arm bicep curls when you're ready.",
+        "Exercise completed. Well done!"),
+
+    "arm_rotation_left": _arm_rotation(
+        "RIGHT", "Bicep Curl Tracker",
+        "Let's begin left arm bicep curls. Start with your left arm straight.",
+        "Exercise complete. Good job!"),
+
+    "arm_rotation_right": _arm_rotation(
+        "LEFT", "Left Bicep Curl Tracker",
+        "Let's begin left arm bicep curls. Start with your right arm straight.",
+        "Exercise complete. Great job on your left arm!"),
+
+    "alternate_toe_touch": {
+        "title": "Cross Crunch Tracker",
+        "model": "pose",
+        "reps": 10,
+        "metrics": {
+            "right_elbow_left_knee": ("distance", "RIGHT_ELBOW", "LEFT_KNEE"),
+            "left_elbow_right_knee": ("distance", "LEFT_ELBOW", "RIGHT_KNEE"),
+            "closest": ("min", "right_elbow_left_knee", "left_elbow_right_knee"),
+        },
+        "show": {
+            "R-Elbow/L-Knee": "right_elbow_left_knee",
+            "L-Elbow/R-Knee": "left_elbow_right_knee",
+        },
+        "highlight": ["RIGHT_ELBOW", "LEFT_ELBOW", "RIGHT_KNEE", "LEFT_KNEE"],
+        "start": "down",
+        "transitions": [
+            {"from": "down", "to": "up", "when": [("closest", "<", 70)]},
+            {"from": "up", "to": "down", "when": [("closest", ">", 70)], "count": True},
+        ],
+        "intro": "Begin standing cross crunches. Lift your knee to opposite elbow.",
+        "finish": "Exercise complete. Well done!",
+    },
+
+    "high_knees": {
+        "title": "High Knees Counter",
+        "model": "pose",
+        "reps": 20,
+        "metrics": {
+            "left_hip": ("ny", "LEFT_HIP"),
+            "right_hip": ("ny", "RIGHT_HIP"),
+            "left_knee": ("ny", "LEFT_KNEE"),
+            "right_knee": ("ny", "RIGHT_KNEE"),
+            "hip": ("mean", "left_hip", "right_hip"),
+            "highest_knee": ("min", "left_knee", "right_knee"),
+            "knee_lift": ("diff", "hip", "highest_knee"),
+        },
+        "start": "down",
+        "transitions": [
+            {"from": "down", "to": "up", "when": [("knee_lift", ">", 0.05)],
+             "cooldown": 0.4, "count": True},
+            {"from": "up", "to": "down", "when": [("knee_lift", "<=", 0.05)]},
+        ],
+        "rep_say": "{count}",
+        "intro": "Start high knees when ready",
+        "finish": "Workout complete! Well done.",
+    },
+
+    "shoulder_shrugs": {
+        "title": "Shoulder Shrug Tracker",
+        "model": "pose",
+        "reps": 10,
+        "metrics": {
+            "right_shoulder": ("y", "RIGHT_SHOULDER"),
+            "left_shoulder": ("y", "LEFT_SHOULDER"),
+            "shoulder_y": ("mean", "right_shoulder", "left_shoulder"),
+        },
+        "calibration": [
+            {"say": "Hold still to set your resting shoulder position for 5 seconds.",
+             "text": "Hold still to set resting shoulder position...",
+             "seconds": 5, "metric": "shoulder_y", "param": "start_line",
+             "reduce": "last", "offset": -20, "settle": 2},
+            {"say": "Now, shrug your shoulders up and hold for 5 seconds.",
+             "text": "Hold shrugged position for 5 seconds...",
+             "seconds": 5, "metric": "shoulder_y", "param": "shrugged_line",
+             "reduce": "min", "offset": 10, "settle": 2, "away": 10},
+        ],
+        "check": {"say": "Hold still with your shoulders relaxed for two seconds.",
+                  "text": "Checking your resting shoulder position...",
+                  "seconds": 2, "tolerance": 15,
+                  "drifted": "Your position has changed. Let's calibrate again."},
+        "guides": [("hline", "start_line"), ("hline", "shrugged_line")],
+        "start": "start",
+        "transitions": [
+            {"from": "start", "to": "up", "when": [("shoulder_y", ">=", "start_line", -5)]},
+            {"from": "up", "to": "hold", "when": [("shoulder_y", "<=", "shrugged_line", 5)]},
+            {"from": "hold", "to": "down", "min_time": 0.5},
+            {"from": "down", "to": "start", "when": [("shoulder_y", ">=", "start_line", -5)],
+             "count": True},
+        ],
+        "intro": "Stand straight and keep your shoulders relaxed for calibration.",
+        "calibrated": "Calibration complete. Start shrugging your shoulders.",
+        "missing": "Ensure your upper body is in frame!",
+        "finish": "Exercise completed. Great job!",
+    },
+
+    "neck_rotation": {
+        "title": "Neck Tilt Tracker",
+        "model": "pose",
+        "reps": 10,
+        "metrics": {
+            "nose_x": ("x", "NOSE"),
+            "left_shoulder_x": ("x", "LEFT_SHOULDER"),
+            "right_shoulder_x": ("x", "RIGHT_SHOULDER"),
+            "center_x": ("mean", "left_shoulder_x", "right_shoulder_x"),
+            "offset": ("diff", "nose_x", "center_x"),
+        },
+        "calibration": [
+            {"say": "Hold your head straight for 5 seconds.",
+             "text": "Hold your head straight...",
+             "seconds": 5, "metric": "offset", "settle": 2},
+            {"say": "Now tilt your head left and hold for 5 seconds.",
+             "text": "Hold left tilt...",
+             "seconds": 5, "metric": "offset", "param": "left_limit", "reduce": "min",
+             "settle": 2, "away": 20},
+            {"say": "Now tilt your head right and hold for 5 seconds.",
+             "text": "Hold right tilt...",
+             "seconds": 5, "metric": "offset", "param": "right_limit", "reduce": "max",
+             "settle": 2, "away": 20, "phase": "right"},
+        ],
+        "check": {"say": "Hold your head straight for two seconds.",
+                  "text": "Checking your head position...",
+                  "seconds": 2, "tolerance": 15,
+                  "drifted": "Your position has changed. Let's calibrate again."},
+        "guides": [("vline", "center_x", "left_limit"), ("vline", "center_x", "right_limit")],
+        "start": "center",
+        "transitions": [
+            {"from": ["center", "right"], "to": "left",
+             "when": [("offset", "<", "left_limit", 20)], "cooldown": 1.0, "count": True},
+            {"from": ["center", "left"], "to": "right",
+             "when": [("offset", ">", "right_limit", -20)], "cooldown": 1.0, "count": True},
+            {"from": ["left", "right"], "to": "center",
+             "when": [("offset", ">=", "left_limit", 20), ("offset", "<=", "right_limit", -20)]},
+        ],
+        "intro": "Sit or stand straight for neck tilt calibration.",
+        "calibrated": "Calibration complete. Start tilting your neck.",
+        "missing": "Ensure your head and shoulders are visible!",
+        "finish": "Exercise complete. Great job!",
+    },
+
+    "wrist_curls": {
+        "title": "Wrist Curl Tracker",
+        "model": "hands",
+        "seed": "pose",
+        "reps": 10,
+        "metrics": {
+            "wrist_y": ("y", "WRIST"),
+            "index_y": ("y", "INDEX_FINGER_TIP"),
+            "lift": ("diff", "index_y", "wrist_y"),
+        },
+        "guides": [("hline", "wrist_y"), ("hline", "index_y")],
+        "start": "down",
+        "transitions": [
+            {"from": "down", "to": "up", "when": [("lift", "<", -30)]},
+            {"from": "up", "to": "down", "when": [("lift", ">", -10)],
+             "min_time": 0.5, "count": True},
+        ],
+        "intro": "Start wrist curl exercise by curling your wrist up and down.",
+        "finish": "Wrist curls completed. Great job!",
+    },
+
+    "cobra_pose": {
+        "title": "Cobra Pose Tracker",
+        "model": "pose",
+        "metrics": {
+            "back": ("angle", "LEFT_KNEE", "LEFT_HIP", "LEFT_SHOULDER"),
+            "neck": ("angle", "LEFT_SHOULDER", "LEFT_HIP", "NOSE"),
+        },
+        "show": {"Back": "back", "Neck": "neck"},
+        "hold": {
+            "when": [("back", ">", 130), ("neck", "<", 70)],
+            "seconds": 60,
+            "cues": [(45, "Almost there, keep holding.")],
+            "reset_on_loss": False,
+            "start_say": "Pose detected. Starting timer.",
+        },
+        "intro": "Get into Cobra Pose position. Timer will begin when pose is detected.",
+        "finish": "One minute completed. Great job!",
+    },
+
+    "tree_pose_left": _tree_pose(
+        "RIGHT", "LEFT", "Tree Pose - Right Leg",
+        "Get into Tree Pose with your right leg bent. Timer will start once pose is detected."),
+
+    "tree_pose_right": _tree_pose(
+        "LEFT", "RIGHT", "Tree Pose - Left Leg",
+        "Get into Tree Pose with your left leg bent. Timer will start once pose is detected."),
+}
+
+
+def _side(spec, label):
+    """One side of a bilateral exercise, with its speech saying which side it is."""
+    side = dict(spec, rep_say=f"{label} {{count}}", finish=f"{label} side done.")
+    if spec.get("hold"):
+        hold = spec["hold"]
+        side["hold"] = dict(hold, cues=[(at, f"{label}: {text}") for at, text in hold.get("cues", ())])
+        for key in ("start_say", "lost_say"):
+            if hold.get(key):
+                side["hold"][key] = f"{label}: {hold[key]}"
+    return side
+
+
+def _bilateral(title, left, right, intro, finish):
+    """Both sides of an exercise, `left` and `right` naming the one for the user's own side.
+
+    Landmarks are in the mirrored view, where the model's RIGHT_* points are
+    the user's own left; the one-sided specs don't all follow that in their
+    names (bicep_curl_left tracks the user's right arm).
+    """
+    return {
+        "title": title,
+        "model": "pose",
+        "reps": EXERCISES[left].get("reps"),
+        "sides": {"left": _side(EXERCISES[left], "Left"), "right": _side(EXERCISES[right], "Right")},
+        "intro": intro,
+        "finish": finish,
+        "stop": "Exercise stopped.",
+    }
+
+
+EXERCISES.update({
+    "bicep_curls": _bilateral(
+        "Bicep Curl Tracker - Both Arms", "bicep_curl_right", "bicep_curl_left",
+        "Start your bicep curls with either arm, or both. Each arm is counted on its own.",
+        "Both arms done. Well done!"),
+
+    "arm_rotations": _bilateral(
+        "Arm Rotation Tracker - Both Arms", "arm_rotation_left", "arm_rotation_right",
+        "Let's begin arm rotations. Start with your arms straight. Each arm is counted on its own.",
+        "Both arms done. Good job!"),
+
+    "tree_pose": _bilateral(
+        "Tree Pose - Both Legs", "tree_pose_left", "tree_pose_right",
+        "Get into Tree Pose on either leg. Each side's timer starts once the pose is detected.",
+        "Both sides completed. Great job!"),
+})
+
+
+# Circuits run back to back by circuit.py: each step is an exercise with
+# optional `reps` (or `seconds` for holds) and `rest` seconds before the next.
+CIRCUITS = {
+    "full_body": {
+        "title": "Full body strength",
+        "intro": "Starting your full body strength workout.",
+        "finish": "Workout complete. Great job today!",
+        "steps": [
+            {"exercise": "neck_rotation", "reps": 6, "rest": 15},
+            {"exercise": "shoulder_shrugs", "reps": 12, "rest": 20},
+            {"exercise": "squats", "reps": 15, "rest": 45},
+            {"exercise": "bicep_curl_left", "reps": 12, "rest": 15},
+            {"exercise": "bicep_curl_right", "reps": 12, "rest": 45},
+            {"exercise": "alternate_toe_touch", "reps": 20, "rest": 45},
+            {"exercise": "high_knees", "reps": 30, "rest": 60},
+            {"exercise": "squats", "reps": 15, "rest": 45},
+            {"exercise": "wrist_curls", "reps": 15, "rest": 20},
+            {"exercise": "arm_rotation_left", "reps": 10, "rest": 15},
+            {"exercise": "arm_rotation_right", "reps": 10, "rest": 30},
+            {"exercise": "tree_pose_left", "seconds": 60, "rest": 20},
+            {"exercise": "tree_pose_right", "seconds": 60, "rest": 30},
+            {"exercise": "cobra_pose", "seconds": 60},
+        ],
+    },
+    "quick": {
+        "title": "Quick desk break",
+        "intro": "Starting a quick desk break.",
+        "finish": "Break complete. Back to work!",
+        "steps": [
+            {"exercise": "neck_rotation", "reps": 6, "rest": 10},
+            {"exercise": "shoulder_shrugs", "reps": 10, "rest": 10},
+            {"exercise": "wrist_curls", "reps": 10},
+        ],
+    },
+}
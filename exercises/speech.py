@@ -0,0 +1,155 @@
+"""Text-to-speech service shared by everything in the process.
+
+One worker thread owns the only pyttsx3 engine, so the voice is looked up
+once, pyttsx3 is imported and started while the camera and models are still
+loading, and the tracking loop never waits on audio: say() just queues the text
+and returns. The queue is small and ordered by priority, and utterances that
+share a key coalesce, so a pending "Repetition 6" is replaced by
+"Repetition 7" instead of both being read out late.
+"""
+
+import heapq
+import itertools
+import sys
+import threading
+import time
+
+LOW, NORMAL, HIGH = 0, 1, 2
+
+
+class Speech:
+    def __init__(self, rate=175, max_pending=8):
+        self.rate = rate
+        self.max_pending = max_pending
+        self.spoken = 0
+        self.dropped = 0
+        self.ready_at = None  # perf_counter() when the engine was up
+
+        self._pending = []  # heap of [-priority, order, text, key]
+        self._keys = {}
+        self._order = itertools.count()
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._worker, name="speech", daemon=True)
+        self._thread.start()
+
+    def _init_engine(self):
+        import pyttsx3
+        engine = pyttsx3.init()
+        for voice in engine.getProperty('voices'):
+            if "english" in voice.name.lower() and "female" in voice.name.lower():
+                engine.setProperty('voice', voice.id)
+                break
+        engine.setProperty('rate', self.rate)
+        return engine
+
+    def say(self, text, key=None, priority=NORMAL):
+        """Queues `text`, replacing any pending utterance with the same `key`."""
+        with self._cond:
+            if self._closed:
+                return
+            if key is not None and key in self._keys:
+                self._keys.pop(key)[2] = None
+                self.dropped += 1
+            item = [-priority, next(self._order), text, key]
+            heapq.heappush(self._pending, item)
+            if key is not None:
+                self._keys[key] = item
+            self._trim()
+            self._cond.notify_all()
+
+    def _trim(self):
+        live = [item for item in self._pending if item[2] is not None]
+        if len(live) <= self.max_pending:
+            return
+        # Drop the least important, most recent utterances first.
+        live.sort()
+        for item in live[self.max_pending:]:
+            item[2] = None
+            if item[3] is not None:
+                self._keys.pop(item[3], None)
+            self.dropped += 1
+
+    def _next(self):
+        with self._cond:
+            while True:
+                while self._pending and self._pending[0][2] is None:
+                    heapq.heappop(self._pending)
+                if self._pending or self._closed:
+                    break
+                self._cond.wait()
+            if not self._pending:
+                return None
+            _, _, text, key = heapq.heappop(self._pending)
+            if key is not None:
+                self._keys.pop(key, None)
+            self._busy = True
+            return text
+
+    def _worker(self):
+        try:
+            engine = self._init_engine()
+        except Exception as e:
+            print(f"Error: Could not start text-to-speech: {e}", file=sys.stderr)
+            engine = None
+        self.ready_at = time.perf_counter()
+
+        while True:
+            text = self._next()
+            if text is None:
+                break
+            try:
+                if engine is not None:
+                    engine.say(text)
+                    engine.runAndWait()
+                    self.spoken += 1
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def idle(self):
+        with self._cond:
+            return not self._busy and not any(item[2] is not None for item in self._pending)
+
+    def wait(self, timeout=None):
+        """Blocks until everything queued so far has been spoken; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._busy and not any(item[2] is not None for item in self._pending),
+                timeout)
+
+    def close(self, timeout=None):
+        """Speaks what is still queued, then stops the worker."""
+        self.wait(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+
+class SilentSpeech:
+    """Stands in for Speech where there is no audio device; nothing is spoken."""
+
+    def say(self, text, key=None, priority=NORMAL):
+        pass
+
+    def wait(self, timeout=None):
+        return True
+
+    def close(self, timeout=None):
+        pass
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_speech():
+    """The process-wide Speech service, started on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = Speech()
+        return _shared
@@ -0,0 +1,189 @@
+"""Annotated frames streamed as JPEG to another process, e.g. the web page.
+
+FrameStreamer.push() is called from the tracking loop and never waits: it
+takes a copy of the frame only when the rate cap allows it and the encoder
+thread is free, and drops it otherwise. The encoder shrinks and compresses
+the frame and publishes the JPEG into a memory-mapped slot guarded by a
+seqlock, the same way progress.py shares its record; FrameReader returns the
+latest one.
+
+Encoding is held to a fraction of the frame interval: when a frame takes
+longer than `budget`, or frames were dropped because the encoder was still
+busy, quality is lowered and then the width; when encoding is comfortably
+fast they recover.
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from progress import RUN_DIR, private_dir
+
+SEQ = struct.Struct("<Q")
+# updated, length, width, height, quality
+HEADER = struct.Struct("<dIHHI")
+CAPACITY = 1 << 20
+
+
+def stream_path(name, run_dir=RUN_DIR):
+    return os.path.join(run_dir, f"frames-{name}.bin")
+
+
+class FrameStreamer:
+    def __init__(self, name="worker", max_fps=15, width=640, min_width=320, quality=80,
+                 min_quality=35, max_quality=90, budget=0.5, run_dir=RUN_DIR):
+        self.max_fps = max_fps
+        self.max_width = width
+        self.min_width = min_width
+        self.width = width
+        self.quality = quality
+        self.min_quality = min_quality
+        self.max_quality = max_quality
+        self.budget = budget / max_fps
+        self.pushed = 0
+        self.dropped = 0
+        self.encoded = 0
+        self.encode_time = 0.0
+
+        private_dir(run_dir)
+        with open(stream_path(name, run_dir), "a+b") as f:
+            f.truncate(SEQ.size + HEADER.size + CAPACITY)
+            self._map = mmap.mmap(f.fileno(), SEQ.size + HEADER.size + CAPACITY)
+        self._seq = SEQ.unpack_from(self._map)[0] & ~1
+
+        self._frame = None
+        self._small = None
+        self._last_push = 0.0
+        self._busy = False
+        self._dropped_busy = 0
+        self._closed = False
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._encoder, name="frame-stream", daemon=True)
+        self._thread.start()
+
+    def push(self, frame):
+        """Hands `frame` to the encoder if the rate cap allows; True if it was taken."""
+        now = time.perf_counter()
+        if now - self._last_push < 1.0 / self.max_fps:
+            return False
+        if self._busy:
+            self.dropped += 1
+            self._dropped_busy += 1
+            return False
+        if self._frame is None or self._frame.shape != frame.shape:
+            self._frame = np.empty_like(frame)
+        np.copyto(self._frame, frame)
+        self._last_push = now
+        self._busy = True
+        self.pushed += 1
+        self._ready.set()
+        return True
+
+    def _encoder(self):
+        while True:
+            self._ready.wait()
+            self._ready.clear()
+            if self._closed:
+                return
+            start = time.perf_counter()
+            image = self._resized()
+            ok, jpeg = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+            self.encode_time = time.perf_counter() - start
+            if ok and len(jpeg) <= CAPACITY:
+                self._publish(jpeg, image.shape)
+                self.encoded += 1
+            self._adapt(ok and len(jpeg) <= CAPACITY)
+            self._busy = False
+
+    def _resized(self):
+        h, w = self._frame.shape[:2]
+        if w <= self.width:
+            return self._frame
+        size = (self.width, int(h * self.width / w))
+        if self._small is None or self._small.shape[1::-1] != size:
+            self._small = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        return cv2.resize(self._frame, size, dst=self._small, interpolation=cv2.INTER_AREA)
+
+    def _adapt(self, fits):
+        if not fits or self.encode_time > self.budget or self._dropped_busy:
+            if self.quality > self.min_quality:
+                self.quality = max(self.min_quality, self.quality - 10)
+            else:
+                self.width = max(self.min_width, int(self.width * 0.8))
+        elif self.encode_time < self.budget / 3:
+            if self.width < self.max_width:
+                self.width = min(self.max_width, int(self.width * 1.25))
+            else:
+                self.quality = min(self.max_quality, self.quality + 5)
+        self._dropped_busy = 0
+
+    def _publish(self, jpeg, shape):
+        h, w = shape[:2]
+        self._seq += 1
+        SEQ.pack_into(self._map, 0, self._seq)
+        offset = SEQ.size + HEADER.size
+        self._map[offset:offset + len(jpeg)] = jpeg.tobytes()
+        HEADER.pack_into(self._map, SEQ.size, time.time(), len(jpeg), w, h, self.quality)
+        self._seq += 1
+        SEQ.pack_into(self._map, 0, self._seq)
+
+    def stats(self):
+        return {"pushed": self.pushed, "dropped": self.dropped, "encoded": self.encoded,
+                "quality": self.quality, "width": self.width, "encode_ms": self.encode_time * 1000}
+
+    def close(self):
+        self._closed = True
+        self._ready.set()
+        self._thread.join(1.0)
+        self._map.close()
+
+
+class StreamedFrame:
+    def __init__(self, seq, updated, jpeg, width, height, quality):
+        self.seq = seq
+        self.updated = updated
+        self.jpeg = jpeg
+        self.width = width
+        self.height = height
+        self.quality = quality
+
+
+class FrameReader:
+    def __init__(self, name="worker", run_dir=RUN_DIR):
+        self.run_dir = run_dir
+        self.path = stream_path(name, run_dir)
+        self._map = None
+
+    def read(self, retries=20):
+        """The latest published frame as a StreamedFrame, or None if there is none."""
+        if self._map is None:
+            try:
+                private_dir(self.run_dir)
+                with open(self.path, "rb") as f:
+                    self._map = mmap.mmap(f.fileno(), SEQ.size + HEADER.size + CAPACITY,
+                                          access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                return None
+
+        offset = SEQ.size + HEADER.size
+        for _ in range(retries):
+            before = SEQ.unpack_from(self._map)[0]
+            if before == 0:
+                return None
+            if before & 1:
+                continue
+            updated, length, width, height, quality = HEADER.unpack_from(self._map, SEQ.size)
+            jpeg = self._map[offset:offset + length]
+            if SEQ.unpack_from(self._map)[0] == before:
+                return StreamedFrame(before, updated, jpeg, width, height, quality)
+        return None
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
@@ -0,0 +1,13 @@
+from engine import print_event, run
+from sources import parse_args
+
+
+def main(source=0, record=None, headless=False, on_event=None):
+    return run("tree_pose", source=source, record=record,
+               headless=headless, on_event=on_event)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(source=args.source, record=args.record,
+         headless=args.headless, on_event=print_event if args.headless else None)
@@ -0,0 +1,220 @@
+"""Long-running exercise worker.
+
+Keeps the camera, the pose and hands models and the speech engine loaded,
+and runs exercises on request, so starting one takes a local round trip
+instead of a fresh interpreter, model load and camera warm-up:
+
+    python3 exercises/worker.py --source 0 --start squats
+    python3 exercises/worker.py --circuit full_body
+
+With "stream" the annotated frames go to stream.FrameStreamer for the web
+page instead of a native window. Clients talk to it with request(), e.g.
+    request({"cmd": "start", "exercise": "squats", "reps": 12, "stream": True})
+    request({"cmd": "circuit", "circuit": "full_body"})
+    request({"cmd": "stop"})
+    request({"cmd": "status"})
+    request({"cmd": "shutdown"})
+
+The worker listens on a Unix socket (a named pipe on Windows) in the
+private run directory, and every connection must prove it knows the random
+key kept next to it (readable by this user only). Messages are JSON, never
+pickles, so a client can only send commands.
+
+Between jobs the camera is throttled to STANDBY_FPS at STANDBY_SIZE, and
+each job gets it back at full rate and resolution.
+"""
+
+import argparse
+import getpass
+import json
+import os
+import queue
+import secrets
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+from progress import RUN_DIR, private_dir
+
+if os.name == "nt":
+    ADDRESS = rf"\\.\pipe\fitdesk-worker-{getpass.getuser()}"
+else:
+    ADDRESS = os.path.join(RUN_DIR, "worker.sock")
+KEY_PATH = os.path.join(RUN_DIR, "worker.key")
+MAX_MESSAGE = 64 * 1024
+# Between jobs the camera stays open, so an exercise starts without waiting
+# for it, but only delivers a small frame a second
+STANDBY_FPS = 1
+STANDBY_SIZE = (320, 240)
+
+
+def authkey(path=KEY_PATH):
+    """This user's worker key, created on first use."""
+    private_dir(os.path.dirname(path))
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(path, "rb") as f:
+            return f.read()
+    key = secrets.token_bytes(32)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+def _send(conn, message):
+    conn.send_bytes(json.dumps(message).encode("utf-8"))
+
+
+def _recv(conn):
+    return json.loads(conn.recv_bytes(MAX_MESSAGE).decode("utf-8"))
+
+
+def request(message, address=ADDRESS):
+    """Sends one command to a running worker and returns its reply.
+
+    Raises ConnectionRefusedError (an OSError) when no worker is listening.
+    """
+    try:
+        conn = Client(address, authkey=authkey())
+    except FileNotFoundError as e:
+        raise ConnectionRefusedError(f"No worker listening at {address}") from e
+    with conn:
+        _send(conn, message)
+        return _recv(conn)
+
+
+class Worker:
+    def __init__(self, source=0, address=ADDRESS):
+        self.source = source
+        self.address = address
+        self.current = None
+        self.last = None
+        self._commands = queue.Queue()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def handle(self, message):
+        cmd = message.get("cmd")
+        with self._lock:
+            if cmd in ("start", "circuit"):
+                if self.current is not None:
+                    return {"ok": False, "error": "busy", "running": self.current}
+                self.current = message["exercise"] if cmd == "start" else message["circuit"]
+                self._commands.put(message)
+                return {"ok": True}
+            if cmd == "stop":
+                if self.current is not None:
+                    self._stop.set()
+                return {"ok": True, "running": self.current}
+            if cmd == "status":
+                return {"ok": True, "running": self.current, "last": self.last}
+            if cmd == "shutdown":
+                self._stop.set()
+                self._commands.put(None)
+                return {"ok": True}
+        return {"ok": False, "error": f"unknown command {cmd!r}"}
+
+    def _listen(self, listener):
+        while True:
+            try:
+                with listener.accept() as conn:
+                    message = _recv(conn)
+                    _send(conn, self.handle(message) if isinstance(message, dict)
+                          else {"ok": False, "error": "bad request"})
+            except (EOFError, OSError, ValueError, AuthenticationError) as e:
+                print(f"Worker connection error: {e}")
+
+    def _listener(self):
+        key = authkey()
+        if os.name != "nt" and os.path.exists(self.address):
+            # Left behind by a worker that didn't exit cleanly, unless one is still answering
+            try:
+                request({"cmd": "status"}, self.address)
+            except OSError:
+                os.remove(self.address)
+            else:
+                raise RuntimeError(f"A worker is already listening at {self.address}")
+        return Listener(self.address, authkey=key)
+
+    def serve(self, start=None):
+        """Loads everything, then runs requests until shutdown; `start` is a first request.
+
+        Requests are accepted (and queued) from before the slow imports, so a
+        client never finds a launched worker not listening yet.
+        """
+        listener = self._listener()
+        threading.Thread(target=self._listen, args=(listener,), daemon=True).start()
+        if start is not None:
+            self.handle(start)
+
+        from circuit import run_circuit
+        from engine import EXERCISES, Session, StreamDisplay, format_startup, run
+        from progress import ProgressWriter
+        from stream import FrameStreamer
+
+        progress = ProgressWriter("worker")
+        progress.update(state="loading")
+        session = Session(self.source)
+        session.progress = progress
+        session.warm(EXERCISES.values())
+        streamed = StreamDisplay(FrameStreamer("worker"))
+        standby = getattr(session.cap, "throttle", None)
+        if standby is not None:
+            standby(fps=STANDBY_FPS, size=STANDBY_SIZE)
+        progress.update(state="idle")
+        print(f"Worker ready on {self.address}")
+        print(format_startup(session.startup_report()))
+
+        try:
+            while True:
+                job = self._commands.get()
+                if job is None:
+                    break
+                name = self.current
+                display = streamed if job.get("stream") else None
+                self._stop.clear()
+                if standby is not None:
+                    standby()
+                try:
+                    if job["cmd"] == "circuit":
+                        counts = run_circuit(job["circuit"], session=session, stop=self._stop, display=display)
+                        self.last = {"circuit": name, "counts": counts}
+                    else:
+                        count = run(name, reps=job.get("reps"), session=session, stop=self._stop,
+                                    display=display)
+                        self.last = {"exercise": name, "count": count}
+                except Exception as e:
+                    print(f"Error running {name}: {e}")
+                    self.last = {"exercise": name, "error": str(e)}
+                    progress.update(state="error", exercise=name, error=str(e))
+                finally:
+                    if standby is not None:
+                        standby(fps=STANDBY_FPS, size=STANDBY_SIZE)
+                    with self._lock:
+                        self.current = None
+        finally:
+            session.close()
+            streamed.streamer.close()
+            progress.close()
+            listener.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keep the exercise trackers loaded and run them on request.")
+    parser.add_argument("--source", default="0",
+                        help="camera index, video file or .fdt landmark trace (default: webcam 0)")
+    parser.add_argument("--address", default=ADDRESS, help=f"socket to listen on (default: {ADDRESS})")
+    parser.add_argument("--start", metavar="EXERCISE", help="exercise to run as soon as the worker is ready")
+    parser.add_argument("--reps", type=int, help="target reps for --start")
+    parser.add_argument("--circuit", help="circuit to run as soon as the worker is ready")
+    parser.add_argument("--stream", action="store_true",
+                        help="stream --start or --circuit to the web page instead of a window")
+    args = parser.parse_args()
+
+    start = None
+    if args.start:
+        start = {"cmd": "start", "exercise": args.start, "reps": args.reps, "stream": args.stream}
+    elif args.circuit:
+        start = {"cmd": "circuit", "circuit": args.circuit, "stream": args.stream}
+    Worker(args.source, args.address).serve(start=start)
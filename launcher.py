@@ -0,0 +1,209 @@
+"""Registry of tracker processes launched from the web app.
+
+Every launch goes through one Registry, which refuses duplicates, reports
+whether each tracker is still running or how it exited, stops trackers on
+request and reaps finished ones so they don't linger as zombies. A pid file
+per tracker in `run_dir`, the private per-user directory the trackers
+publish into (see progress.private_dir), lets every app process of the user
+see the trackers the others started.
+
+The cap on concurrent trackers holds for the whole host, whichever user
+launched them, since they would all fight over the camera: each running
+tracker keeps an flock on one of `max_running` slot files in the shared
+SLOT_DIR (FITDESK_SLOT_DIR, by default /tmp/fitdesk-trackers), and the
+lock goes away with the tracker however it exits. Without flock (Windows)
+the cap falls back to this user's pid files.
+"""
+
+import os
+import signal
+import stat
+import subprocess
+import sys
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "exercises"))
+from progress import RUN_DIR, private_dir  # noqa: E402
+
+MAX_TRACKERS = int(os.environ.get("FITDESK_MAX_TRACKERS", "1"))
+SLOT_DIR = os.environ.get("FITDESK_SLOT_DIR", "/tmp/fitdesk-trackers")
+
+
+class TrackerLimitError(RuntimeError):
+    pass
+
+
+class Tracker:
+    def __init__(self, name, argv, process, pid_file):
+        self.name = name
+        self.argv = argv
+        self.process = process
+        self.pid_file = pid_file
+        self.started = time.time()
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    @property
+    def returncode(self):
+        return self.process.poll()
+
+    @property
+    def running(self):
+        return self.returncode is None
+
+    def status(self):
+        return {"name": self.name, "pid": self.pid, "running": self.running,
+                "returncode": self.returncode, "uptime": time.time() - self.started}
+
+
+def _slot_dir(path=SLOT_DIR):
+    """Creates the host-wide slot directory, which every user must be able to add slots to."""
+    try:
+        os.mkdir(path)
+        # Sticky, like /tmp: users can add slot files but not remove each other's
+        os.chmod(path, 0o1777)
+    except FileExistsError:
+        if not stat.S_ISDIR(os.lstat(path).st_mode):
+            raise PermissionError(f"{path} is not a directory")
+    return path
+
+
+def _claim_slot(max_running, path=SLOT_DIR):
+    """An open file holding one of the host's `max_running` tracker slots, or None when all are taken."""
+    _slot_dir(path)
+    flags = os.O_RDONLY | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0)
+    for i in range(max_running):
+        fd = os.open(os.path.join(path, f"slot-{i}.lock"), flags, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            continue
+        return fd
+    return None
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Registry:
+    def __init__(self, max_running=MAX_TRACKERS, run_dir=RUN_DIR):
+        self.max_running = max_running
+        self.run_dir = run_dir
+        self.trackers = {}
+        self._lock = threading.Lock()
+        private_dir(run_dir)
+
+    def _host_pids(self):
+        """Pids of live trackers started by any registry of this user; stale pid files are removed."""
+        pids = {}
+        for entry in os.listdir(self.run_dir):
+            if not entry.endswith(".pid"):
+                continue
+            path = os.path.join(self.run_dir, entry)
+            try:
+                with open(path) as f:
+                    pid = int(f.read().split()[0])
+            except (OSError, ValueError, IndexError):
+                continue
+            if _alive(pid):
+                pids[pid] = entry[:-4].split(".", 1)[-1]
+            else:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        return pids
+
+    def reap(self):
+        """Collects exit codes of finished trackers and drops their pid files."""
+        for tracker in self.trackers.values():
+            if not tracker.running and os.path.exists(tracker.pid_file):
+                try:
+                    os.remove(tracker.pid_file)
+                except OSError:
+                    pass
+
+    def launch(self, name, argv, **popen_kwargs):
+        """Starts `argv` as tracker `name`, or returns the tracker already running under that name.
+
+        Raises TrackerLimitError when the host already runs `max_running` trackers, of any user.
+        """
+        with self._lock:
+            self.reap()
+            tracker = self.trackers.get(name)
+            if tracker is not None and tracker.running:
+                return tracker
+
+            host = self._host_pids()
+            slot = None
+            if fcntl is not None:
+                slot = _claim_slot(self.max_running)
+                full = slot is None
+            else:
+                full = len(host) >= self.max_running
+            if full:
+                ours = f" (yours: {', '.join(sorted(host.values()))})" if host else ""
+                raise TrackerLimitError(f"{self.max_running} tracker(s) already running on this host{ours}")
+
+            popen_kwargs.setdefault("stdout", subprocess.DEVNULL)
+            popen_kwargs.setdefault("stderr", subprocess.DEVNULL)
+            popen_kwargs.setdefault("start_new_session", True)
+            if slot is not None:
+                # The tracker inherits the locked slot and holds it until it exits
+                popen_kwargs["pass_fds"] = tuple(popen_kwargs.get("pass_fds", ())) + (slot,)
+            try:
+                process = subprocess.Popen(argv, **popen_kwargs)
+            finally:
+                if slot is not None:
+                    os.close(slot)
+            pid_file = os.path.join(self.run_dir, f"{process.pid}.{name}.pid")
+            with open(pid_file, "w") as f:
+                f.write(f"{process.pid}\n")
+            tracker = Tracker(name, argv, process, pid_file)
+            self.trackers[name] = tracker
+            return tracker
+
+    def stop(self, name, timeout=3.0):
+        """Terminates tracker `name` (killing it after `timeout` seconds) and returns its exit code."""
+        with self._lock:
+            tracker = self.trackers.get(name)
+            if tracker is None:
+                return None
+            if tracker.running:
+                try:
+                    # Trackers lead their own session, so this also reaches anything they started
+                    os.killpg(tracker.pid, signal.SIGTERM)
+                except (AttributeError, ProcessLookupError, PermissionError):
+                    tracker.process.terminate()
+                try:
+                    tracker.process.wait(timeout)
+                except subprocess.TimeoutExpired:
+                    tracker.process.kill()
+                    tracker.process.wait()
+            self.reap()
+            return tracker.returncode
+
+    def stop_all(self):
+        for name in list(self.trackers):
+            self.stop(name)
+
+    def status(self):
+        with self._lock:
+            self.reap()
+            return [tracker.status() for tracker in self.trackers.values()]